@@ -6,71 +6,68 @@ Détecte automatiquement le nombre de frames et ajuste le jeu
 """
 
 import os
-import json
+import argparse
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
-def detect_sprite_frames():
+from sprite_batch import run_batch, add_jobs_argument, batch_counts, batch_ok
+from sprite_cache import load_manifest, save_manifest, split_cached_tasks, record_tasks
+from sprite_index import build_sprite_index, animation_summary, update_schema_from_index, frame_tasks
+from sprite_schema import DEFAULT_FRAME_DURATION, SCHEMA_PATH, load_sprite_schema, save_sprite_schema
+from image_cache import load_image
+from sprite_timing import stage, run_timed, timing_report
+
+def detect_sprite_frames(character='ninja', assets_dir='./assets/characters', index=None):
     """Détecte automatiquement le nombre de frames par animation"""
     
     print("🔍 DÉTECTION AUTOMATIQUE DES ANIMATIONS")
     print("=" * 50)
     
-    assets_dir = Path('./assets/characters')
-    skills_dir = assets_dir / 'skills'
-    
-    # Animations possibles
-    animations = ['idle', 'walk', 'jump', 'attack', 'hurt', 'special']
+    # Un seul parcours de assets/characters/<perso>/<catégorie>/
+    ignored = []
+    if index is None:
+        index, ignored = build_sprite_index(assets_dir)
+    animations = index.get(character, {})
     
     detected_config = {}
     
-    for anim in animations:
-        frame_count = 0
+    for anim in sorted(animations):
+        anim_entry = animations[anim]
+        frame_count, gaps = animation_summary(anim_entry)
         
-        # Compter les frames existantes
-        for i in range(1, 10):  # Maximum 9 frames par animation
-            if anim == 'special':
-                # Chercher dans le dossier skills/
-                sprite_file = skills_dir / f"ninja_special{i}.png"
-            else:
-                # Chercher dans le dossier principal
-                sprite_file = assets_dir / f"ninja_{anim}{i}.png"
-                
-            if sprite_file.exists():
-                frame_count = i
-            else:
-                break
+        detected_config[anim] = frame_count
+        print(f"   ✅ {anim}: {frame_count} frames ({anim_entry['category']}/)")
         
-        if frame_count > 0:
-            detected_config[anim] = frame_count
-            location = "skills/" if anim == 'special' else "normal"
-            print(f"   ✅ {anim}: {frame_count} frames ({location})")
-        else:
-            print(f"   ❌ {anim}: Aucune frame trouvée")
+        if gaps:
+            missing = ', '.join(f"{character}_{anim}{n}.png" for n in gaps)
+            print(f"      ⚠️ Frames manquantes: {missing}")
+    
+    if not detected_config:
+        print(f"   ❌ {character}: Aucune frame trouvée")
+    
+    for path, reason in ignored:
+        print(f"   ⚠️ Sprite ignoré: {path} ({reason})")
     
     return detected_config
 
-def optimize_sprite_quality(input_path, output_path):
+def optimize_sprite_quality(input_path, output_path, target_size=80):
     """Optimise un sprite sans perte de qualité"""
     
-    with Image.open(input_path) as img:
-        # Convertir en RGBA si nécessaire
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        
-        original_size = img.size
-        
-        # Si déjà 80x80, juste optimiser
-        if original_size == (80, 80):
+    with stage('decode'):
+        img = load_image(input_path)
+    original_size = img.size
+    
+    # Si déjà à la taille cible, juste optimiser
+    if original_size == (target_size, target_size):
+        with stage('encode'):
             img.save(output_path, 'PNG', optimize=True)
-            return f"Optimisé: {original_size}"
-        
-        # Sinon, redimensionner intelligemment
-        # Calculer le ratio pour garder les proportions
-        target_size = 80
-        
-        # Méthode de redimensionnement haute qualité
+        return f"Optimisé: {original_size}"
+    
+    # Sinon, redimensionner intelligemment
+    # Calculer le ratio pour garder les proportions
+    # Méthode de redimensionnement haute qualité
+    with stage('resize'):
         if original_size[0] != original_size[1]:
             # Image non carrée - ajuster avec padding
             max_dim = max(original_size)
@@ -91,114 +88,112 @@ def optimize_sprite_quality(input_path, output_path):
         else:
             # Image carrée - redimensionnement direct
             final_img = img.resize((target_size, target_size), Image.Resampling.LANCZOS)
-        
-        # Sauvegarder avec optimisation
-        final_img.save(output_path, 'PNG', optimize=True)
-        
-        return f"Redimensionné: {original_size} → {target_size}x{target_size}"
-
-def update_game_config(animation_config):
-    """Met à jour la configuration du jeu avec les bonnes frames"""
-    
-    print("\n🔧 MISE À JOUR DE LA CONFIGURATION DU JEU")
-    print("-" * 45)
-    
-    # Lire le fichier stable.html
-    stable_file = Path('./stable.html')
-    
-    if not stable_file.exists():
-        print("❌ Fichier stable.html non trouvé!")
-        return False
     
-    with open(stable_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Créer la nouvelle configuration JavaScript
-    js_config = "const animationConfig = {\n"
-    js_config += "    ninja: {\n"
-    
-    for anim, frame_count in animation_config.items():
-        js_config += f"        {anim}: {frame_count},\n"
+    # Sauvegarder avec optimisation
+    with stage('encode'):
+        final_img.save(output_path, 'PNG', optimize=True)
     
-    js_config += "    }\n};"
+    return f"Redimensionné: {original_size} → {target_size}x{target_size}"
+
+def write_animation_manifest(index, output_path=SCHEMA_PATH, frame_duration=DEFAULT_FRAME_DURATION):
+    """Met à jour sprite_schema.json d'après les frames présentes
     
-    print("📝 Nouvelle configuration:")
-    for anim, count in animation_config.items():
-        print(f"   {anim}: {count} frames")
+    Les pages du jeu et js/assets.js chargent ce fichier au démarrage: une
+    nouvelle configuration ne réécrit plus stable.html. Seules les frames
+    disponibles ('available') suivent le disque; les nombres déclarés ne
+    baissent pas (voir sprite_index.update_schema_from_index).
+    """
     
-    # Chercher et remplacer la configuration dans le code
-    # Trouver la section des maxFrames
-    max_frames_section = "const maxFrames = {"
+    print("\n🔧 SCHÉMA DES ANIMATIONS")
+    print("-" * 45)
     
-    if max_frames_section in content:
-        # Remplacer la section maxFrames
-        start_idx = content.find(max_frames_section)
-        if start_idx != -1:
-            # Trouver la fin de l'objet
-            end_idx = content.find("};", start_idx) + 2
-            
-            # Créer la nouvelle section
-            new_max_frames = "const maxFrames = {\n"
-            for anim, count in animation_config.items():
-                new_max_frames += f"                        '{anim}': {count},\n"
-            new_max_frames += "                    }"
-            
-            # Remplacer
-            content = content[:start_idx] + new_max_frames + content[end_idx:]
-            
-            print("   ✅ Configuration maxFrames mise à jour")
+    manifest = update_schema_from_index(load_sprite_schema(output_path), index, frame_duration)
+    for character, animations in manifest['characters'].items():
+        incomplete = [anim for anim, config in animations.items() if config['available'] < config['frames']]
+        detail = f" (incomplètes: {', '.join(incomplete)})" if incomplete else ''
+        print(f"   ✅ {character}: {len(animations)} animations{detail}")
     
-    # Sauvegarder le fichier modifié
-    with open(stable_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    save_sprite_schema(manifest, output_path)
+    print(f"   📝 Sauvé dans: {output_path}")
     
-    print("   ✅ Fichier stable.html mis à jour")
+    return manifest
+
+def optimize_sprite_file(sprite_file, output_path, target_size=80):
+    """Optimise un sprite et affiche le résultat (tâche d'un lot)"""
     
-    return True
+    try:
+        result = optimize_sprite_quality(sprite_file, output_path, target_size)
+        print(f"   ✅ {sprite_file.name}: {result}")
+        return True
+    except Exception as e:
+        print(f"   ❌ {sprite_file.name}: Erreur - {e}")
+        return False
 
-def process_all_sprites():
-    """Traite tous les sprites sans perte de qualité"""
+def process_all_sprites(jobs=1, force=False, target_size=80, timings_path=None,
+                        assets_dir='./assets/characters', characters=None, index=None):
+    """Traite les frames de tous les personnages sans perte de qualité
+    
+    Les frames de <perso>/<catégorie>/ sont écrites au même emplacement
+    sous optimized/ (avec temps par étape). Retourne le bilan du lot
+    (voir sprite_batch.batch_counts).
+    """
     
     print("🎯 OPTIMISATION SANS PERTE DE QUALITÉ")
     print("=" * 50)
     
-    assets_dir = Path('./assets/characters')
+    assets_dir = Path(assets_dir)
     optimized_dir = assets_dir / 'optimized'
     optimized_dir.mkdir(exist_ok=True)
     
-    # Trouver tous les sprites ninja
-    ninja_sprites = list(assets_dir.glob('ninja_*.png'))
+    # Frames de tous les personnages, en un seul parcours
+    if index is None:
+        index, ignored = build_sprite_index(assets_dir)
+    tasks = [
+        (source, output, target_size)
+        for source, output in frame_tasks(index, optimized_dir, characters)
+    ]
     
-    if not ninja_sprites:
-        print("❌ Aucun sprite ninja trouvé!")
-        return False
+    if not tasks:
+        print("❌ Aucun sprite trouvé!")
+        return batch_counts(0, 0, [])
     
-    print(f"🎨 {len(ninja_sprites)} sprites à optimiser")
+    print(f"🎨 {len(tasks)} sprites à optimiser")
     
-    success_count = 0
+    # Ne retraiter que les sprites modifiés depuis la dernière optimisation
+    params = {'target_size': target_size}
+    manifest = load_manifest(optimized_dir)
+    todo, cached, hashes = split_cached_tasks(manifest, tasks, params, force, base=optimized_dir)
+    if cached:
+        print(f"⏭️ {len(cached)} sprites déjà à jour (cache)")
     
-    for sprite_file in ninja_sprites:
-        try:
-            output_path = optimized_dir / sprite_file.name
-            result = optimize_sprite_quality(sprite_file, output_path)
-            print(f"   ✅ {sprite_file.name}: {result}")
-            success_count += 1
-        except Exception as e:
-            print(f"   ❌ {sprite_file.name}: Erreur - {e}")
+    for parent in sorted({task[1].parent for task in todo}):
+        parent.mkdir(parents=True, exist_ok=True)
     
-    print(f"\n📊 {success_count}/{len(ninja_sprites)} sprites optimisés")
+    timed = run_batch(run_timed, [(optimize_sprite_file,) + task for task in todo], jobs)
+    results = [result for result, _ in timed]
+    record_tasks(manifest, todo, hashes, results, params, base=optimized_dir)
+    save_manifest(manifest, optimized_dir)
     
-    return success_count > 0
+    timing_report([task[0].name for task in todo], [timings for _, timings in timed], timings_path)
+    
+    success_count = len(cached) + sum(results)
+    
+    print(f"\n📊 {success_count}/{len(tasks)} sprites optimisés")
+    
+    return batch_counts(len(tasks), len(cached), results)
 
-def main():
-    """Fonction principale"""
+def main(jobs=1, force=False, timings_path=None, root='.'):
+    """Fonction principale (root: dossier du jeu)"""
+    
+    assets_dir = Path(root) / 'assets' / 'characters'
     
     print("🎮 AJUSTEMENT AUTOMATIQUE DES SPRITES")
     print("Sans perte de qualité + Configuration adaptative")
     print("=" * 60)
     
     # 1. Détecter les animations disponibles
-    animation_config = detect_sprite_frames()
+    index, ignored = build_sprite_index(assets_dir)
+    animation_config = detect_sprite_frames(index=index)
     
     if not animation_config:
         print("\n❌ Aucune animation détectée!")
@@ -208,23 +203,22 @@ def main():
     print(f"\n🎨 OPTIMISATION DES SPRITES")
     print("-" * 30)
     
-    if process_all_sprites():
+    if batch_ok(process_all_sprites(jobs, force, timings_path=timings_path, assets_dir=assets_dir, index=index)):
         print("✅ Sprites optimisés avec succès")
         
-        # Copier les sprites optimisés
+        # Remettre chaque sprite optimisé à la place de sa source
         print("\n📁 Copie des sprites optimisés...")
-        assets_dir = Path('./assets/characters')
         optimized_dir = assets_dir / 'optimized'
         
         import shutil
-        for sprite_file in optimized_dir.glob('ninja_*.png'):
-            dest_file = assets_dir / sprite_file.name
-            shutil.copy2(sprite_file, dest_file)
-            print(f"   ✅ Copié: {sprite_file.name}")
+        for source, output in frame_tasks(index, optimized_dir):
+            if output.exists():
+                shutil.copy2(output, source)
+                print(f"   ✅ Copié: {source.name}")
     
-    # 3. Mettre à jour la configuration du jeu
-    if update_game_config(animation_config):
-        print("✅ Configuration du jeu mise à jour")
+    # 3. Mettre à jour le schéma des animations chargé par le jeu
+    if write_animation_manifest(index, Path(root) / 'sprite_schema.json'):
+        print("✅ Schéma des animations mis à jour")
     
     # 4. Instructions finales
     print(f"\n🚀 TERMINÉ!")
@@ -237,8 +231,20 @@ def main():
     return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajustement automatique des sprites")
+    parser.add_argument('--force', action='store_true',
+                        help="Retraiter tous les sprites en ignorant le cache")
+    parser.add_argument('--timings', metavar='FICHIER',
+                        help="Enregistrer les temps par étape et par fichier (JSON)")
+    parser.add_argument('--root', default='.',
+                        help="Dossier du jeu (contenant assets/characters)")
+    parser.add_argument('--pause', action='store_true',
+                        help="Attendre Entrée avant de quitter (lancement par double-clic)")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
     try:
-        success = main()
+        success = main(args.jobs, args.force, args.timings, args.root)
         
         if success:
             print("\n🎉 AJUSTEMENT TERMINÉ AVEC SUCCÈS!")
@@ -248,4 +254,5 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n❌ Erreur: {e}")
     
-    input("\n⏸️ Appuyez sur Entrée pour continuer...")
\ No newline at end of file
+    if args.pause:
+        input("\n⏸️ Appuyez sur Entrée pour continuer...")
\ No newline at end of file
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ Benchmarks des fonctions de traitement des sprites
+Génère des sprites RGBA synthétiques (fond connu, de 80x80 à 4096x4096),
+mesure le temps par mégapixel et le pic mémoire de chaque fonction, puis
+enregistre une référence JSON à laquelle les exécutions suivantes sont
+comparées pour signaler les régressions
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+
+try:
+    import resource
+except ImportError:
+    # Windows: pas de mesure du pic mémoire
+    resource = None
+
+from sprite_batch import run_captured
+
+BENCHMARK_VERSION = 1
+DEFAULT_SIZES = [80, 256, 1024, 4096]
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+# Fonds connus des sprites synthétiques (RGB)
+BACKGROUNDS = {
+    'white': (255, 255, 255),
+    'blue': (40, 120, 230),
+}
+
+def make_sprite(size, background, seed=0):
+    """Sprite synthétique: silhouette sombre bruitée sur un fond uni opaque
+    
+    Le bord de la silhouette est adouci pour produire des pixels de
+    transition comme dans les sprites réels.
+    """
+    
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / max(1, size - 1)
+    
+    # Corps elliptique + tête, distance signée normalisée
+    body = ((x - 0.5) / 0.22) ** 2 + ((y - 0.62) / 0.3) ** 2
+    head = ((x - 0.5) / 0.12) ** 2 + ((y - 0.24) / 0.12) ** 2
+    inside = np.clip((1.15 - np.minimum(body, head)) * 6, 0, 1)[..., None]
+    
+    figure = np.empty((size, size, 3), dtype=np.float32)
+    figure[..., 0] = 40 + 60 * x
+    figure[..., 1] = 30 + 40 * y
+    figure[..., 2] = 50 + 30 * (1 - x)
+    figure += rng.normal(0, 8, figure.shape).astype(np.float32)
+    
+    rgb = inside * figure + (1 - inside) * np.array(BACKGROUNDS[background], dtype=np.float32)
+    
+    data = np.empty((size, size, 4), dtype=np.uint8)
+    data[..., :3] = np.clip(rgb, 0, 255)
+    data[..., 3] = 255
+    return Image.fromarray(data, 'RGBA')
+
+def bench_clean_sprite_advanced(path, workdir):
+    from clean_sprites_advanced import clean_sprite_advanced
+    return lambda: clean_sprite_advanced(path, os.path.join(workdir, 'out.png'), 'standard')
+
+def bench_remove_background_auto(path, workdir):
+    from process_sprites import remove_background_auto
+    return lambda: remove_background_auto(path, os.path.join(workdir, 'out.png'))
+
+def bench_optimize_sprite_quality(path, workdir):
+    from auto_adjust_sprites import optimize_sprite_quality
+    return lambda: optimize_sprite_quality(path, os.path.join(workdir, 'out.png'))
+
+def skills_workspace(path, workdir):
+    """Dossier skills temporaire et remise à zéro de son sprite
+    
+    Les scripts des sprites spéciaux réécrivent leurs fichiers en place:
+    le sprite d'origine est recopié avant chaque mesure (hors chrono).
+    """
+    
+    skills = Path(workdir) / 'skills'
+    skills.mkdir(parents=True, exist_ok=True)
+    return skills, lambda: shutil.copy(path, skills / 'skill1.png')
+
+def bench_remove_background_skills(path, workdir):
+    from clean_skills_background import remove_background_skills
+    skills, reset = skills_workspace(path, workdir)
+    return reset, lambda: remove_background_skills('numpy', skills)
+
+def bench_resize_skills_sprites(path, workdir):
+    from resize_skills import resize_skills_sprites
+    skills, reset = skills_workspace(path, workdir)
+    return reset, lambda: resize_skills_sprites(skills, force=True)
+
+# Fonction mesurée → (préparation, fond du sprite synthétique)
+# La préparation retourne la fonction à chronométrer, ou (remise à zéro, fonction)
+BENCHMARKS = {
+    'clean_sprite_advanced': (bench_clean_sprite_advanced, 'white'),
+    'remove_background_auto': (bench_remove_background_auto, 'white'),
+    'optimize_sprite_quality': (bench_optimize_sprite_quality, 'white'),
+    'remove_background_skills': (bench_remove_background_skills, 'blue'),
+    'resize_skills_sprites': (bench_resize_skills_sprites, 'blue'),
+}
+
+def reset_peak_memory():
+    """Remet le pic de mémoire résidente au niveau actuel (Linux uniquement)"""
+    
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+def peak_rss_bytes():
+    """Pic de mémoire résidente du processus (None si non mesurable)
+    
+    Sous Linux, VmHWM peut être remis à zéro par reset_peak_memory(); ailleurs
+    ru_maxrss garde le pic depuis le démarrage (hérité du parent au fork).
+    """
+    
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets ailleurs
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def run_case(name, path, repeat):
+    """Mesure une fonction sur un sprite, dans un processus neuf
+    
+    Retourne (meilleur temps en secondes, pic mémoire ajouté en octets).
+    """
+    
+    from image_cache import clear_image_cache
+    
+    workdir = tempfile.mkdtemp(prefix='bench_')
+    try:
+        prepared = BENCHMARKS[name][0](path, workdir)
+        reset, func = prepared if isinstance(prepared, tuple) else (None, prepared)
+        
+        reset_peak_memory()
+        before = peak_rss_bytes()
+        times = []
+        for _ in range(repeat):
+            if reset:
+                reset()
+            # Chaque mesure doit décoder l'image comme une première exécution
+            clear_image_cache()
+            start = time.perf_counter()
+            run_captured(func, ())
+            times.append(time.perf_counter() - start)
+        after = peak_rss_bytes()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    peak = after - before if before is not None else None
+    return min(times), peak
+
+def run_benchmarks(names, sizes, repeat=3):
+    """Exécute les benchmarks demandés et retourne le rapport"""
+    
+    print("⏱️ BENCHMARKS DES SPRITES")
+    print("=" * 50)
+    
+    results = {}
+    sprite_dir = tempfile.mkdtemp(prefix='bench_sprites_')
+    # spawn: chaque mesure part d'un processus vierge (pic mémoire comparable)
+    context = multiprocessing.get_context('spawn')
+    
+    try:
+        for size in sizes:
+            sprites = {}
+            for background in sorted({BENCHMARKS[name][1] for name in names}):
+                sprites[background] = os.path.join(sprite_dir, f"{background}_{size}.png")
+                make_sprite(size, background).save(sprites[background])
+            
+            megapixels = size * size / 1e6
+            for name in names:
+                path = os.path.abspath(sprites[BENCHMARKS[name][1]])
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    seconds, peak = executor.submit(run_case, name, path, repeat).result()
+                
+                results[f"{name}@{size}"] = {
+                    'function': name,
+                    'size': size,
+                    'seconds': seconds,
+                    'ms_per_megapixel': seconds * 1000 / megapixels,
+                    'peak_memory_mb': peak / 2 ** 20 if peak is not None else None,
+                }
+                
+                memory = f"{peak / 2 ** 20:7.1f} Mo" if peak is not None else "    n/a"
+                print(f"   {name:<26} {size:>5}px  {seconds * 1000:9.1f} ms  "
+                      f"{seconds * 1000 / megapixels:9.1f} ms/Mpx  {memory}")
+    finally:
+        shutil.rmtree(sprite_dir, ignore_errors=True)
+    
+    return {
+        'version': BENCHMARK_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+def compare_reports(baseline, report, tolerance=0.25):
+    """Liste les régressions de temps ou de mémoire au-delà de la tolérance"""
+    
+    regressions = []
+    for key, result in report['results'].items():
+        reference = baseline.get('results', {}).get(key)
+        if reference is None:
+            continue
+        
+        for metric in ('ms_per_megapixel', 'peak_memory_mb'):
+            old, new = reference.get(metric), result.get(metric)
+            # Pics mémoire de moins de 1 Mo: bruit de mesure
+            if old is None or new is None or (metric == 'peak_memory_mb' and new < 1):
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append((key, metric, old, new))
+    
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks des fonctions de traitement des sprites")
+    parser.add_argument('--functions', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Fonctions à mesurer (toutes par défaut)")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help="Côtés des sprites synthétiques (pixels)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Nombre de mesures par cas (le meilleur temps est gardé)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help="Fichier JSON de référence")
+    parser.add_argument('--save', action='store_true',
+                        help="Enregistrer ces mesures comme nouvelle référence")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Écart toléré avant de signaler une régression (0.25 = +25%%)")
+    args = parser.parse_args()
+    
+    report = run_benchmarks(args.functions, args.sizes, args.repeat)
+    
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        
+        regressions = compare_reports(baseline, report, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) par rapport à {args.baseline}:")
+            for key, metric, old, new in regressions:
+                print(f"   {key} {metric}: {old:.1f} → {new:.1f} (+{(new / old - 1) * 100:.0f}%)")
+            sys.exit(1)
+        print(f"\n✅ Aucune régression par rapport à {args.baseline}")
+    else:
+        print(f"\nℹ️ Pas de référence ({args.baseline}): relancer avec --save pour en créer une")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔍 Variantes 1x / 2x / 0.5x des frames et des atlas
+Chaque frame source est décodée une fois et écrite à toutes les échelles
+(assets/variants/<échelle>/<perso>/<catégorie>/), puis un atlas est
+construit par échelle. assets/variants/index.json indique au jeu quelle
+échelle charger selon window.devicePixelRatio: plus de mise à l'échelle
+du canvas à l'affichage, et des téléchargements réduits sur petit écran.
+Une échelle n'est produite que si toutes les sources ont assez de
+pixels pour elle: agrandir n'ajoute que des octets, sans détail. Le jeu
+prend alors la plus grande échelle disponible et la dessine sans
+lissage.
+"""
+
+import json
+import shutil
+import argparse
+from pathlib import Path
+from PIL import Image
+
+from sprite_batch import run_batch, add_jobs_argument
+from sprite_cache import load_manifest, save_manifest, split_cached_tasks, record_tasks
+from sprite_index import build_sprite_index
+from image_cache import load_image
+from pack_atlas import pack_character
+
+# Taille de référence d'une frame à l'échelle 1x (pixels CSS)
+BASE_FRAME_SIZE = 80
+
+# Échelles produites: étiquette → facteur (pixels image par pixel CSS)
+VARIANT_SCALES = {
+    '0.5x': 0.5,
+    '1x': 1,
+    '2x': 2,
+}
+
+INDEX_FILENAME = 'index.json'
+
+def base_size(size, base=BASE_FRAME_SIZE):
+    """Taille 1x d'une frame: ramenée dans base x base si plus grande"""
+    
+    w, h = size
+    if max(w, h) <= base:
+        return w, h
+    ratio = base / max(w, h)
+    return max(1, round(w * ratio)), max(1, round(h * ratio))
+
+def variant_image(img, scale, base=BASE_FRAME_SIZE):
+    """Frame à l'échelle demandée, rééchantillonnée depuis la source
+    
+    Réduction par moyenne de boîte (filtre des mipmaps): moins de couleurs
+    nouvelles que LANCZOS, donc un PNG 0.5x plus léger que le 1x. Les
+    échelles au-delà de la source sont écartées par supported_labels.
+    """
+    
+    target = variant_size(img.size, scale, base)
+    if target == img.size:
+        return img
+    return img.resize(target, Image.Resampling.BOX)
+
+def variant_size(size, scale, base=BASE_FRAME_SIZE):
+    w, h = base_size(size, base)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+def supported_labels(sizes, labels, base=BASE_FRAME_SIZE):
+    """Échelles qu'aucune source n'aurait à agrandir
+    
+    sizes: tailles (largeur, hauteur) des frames sources. Retourne
+    (échelles gardées, échelles écartées).
+    """
+    
+    def fits(size, scale):
+        w, h = variant_size(size, scale, base)
+        return w <= size[0] and h <= size[1]
+    
+    kept, skipped = [], []
+    for label in labels:
+        if all(fits(size, VARIANT_SCALES[label]) for size in sizes):
+            kept.append(label)
+        else:
+            skipped.append(label)
+    return kept, skipped
+
+def build_frame_variants(source, outputs, base=BASE_FRAME_SIZE):
+    """Écrit toutes les échelles d'une frame à partir d'un seul décodage
+    
+    outputs: [(étiquette, chemin)].
+    """
+    
+    try:
+        img = load_image(source)
+        for label, output in outputs:
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            variant_image(img, VARIANT_SCALES[label], base).save(output, 'PNG', optimize=True)
+        return True
+    except Exception as e:
+        print(f"   ❌ {Path(source).name}: Erreur - {e}")
+        return False
+
+def write_variant_index(variants_dir, atlas_dir, labels, base=BASE_FRAME_SIZE, root='.'):
+    """Écrit l'index des échelles, trié par facteur croissant
+    
+    Le jeu prend la plus petite échelle >= devicePixelRatio (la plus
+    grande à défaut). Les chemins sont relatifs à la racine du jeu.
+    """
+    
+    def relative(path):
+        return Path(path).resolve().relative_to(Path(root).resolve()).as_posix()
+    
+    index = {
+        'version': 1,
+        'base': base,
+        'variants': [
+            {
+                'label': label,
+                'scale': VARIANT_SCALES[label],
+                'frames': relative(Path(variants_dir) / label),
+                'atlases': relative(Path(atlas_dir) / label),
+            }
+            for label in sorted(labels, key=VARIANT_SCALES.get)
+        ],
+    }
+    
+    index_path = Path(variants_dir) / INDEX_FILENAME
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+        f.write('\n')
+    return index
+
+def atlas_matches(map_path, trim):
+    """Vrai si la carte d'atlas existe et a été construite avec ce recadrage"""
+    
+    try:
+        with open(map_path, encoding='utf-8') as f:
+            return bool(json.load(f).get('trimmed')) == trim
+    except (OSError, ValueError):
+        return False
+
+def build_variants(root='.', labels=tuple(VARIANT_SCALES), jobs=1, force=False, padding=1,
+                   base=BASE_FRAME_SIZE, trim=False):
+    """Produit les frames et les atlas de chaque échelle
+    
+    Seules les frames dont la source a changé sont refaites; seuls les
+    atlas des personnages touchés (ou absents, ou construits avec un autre
+    recadrage) sont reconstruits. Les échelles qui demanderaient
+    d'agrandir une source sont écartées et leurs anciennes sorties
+    supprimées. Retourne l'index des échelles.
+    """
+    
+    print("🔍 VARIANTES MULTI-RÉSOLUTION")
+    print("=" * 50)
+    
+    root = Path(root)
+    assets_dir = root / 'assets' / 'characters'
+    variants_dir = root / 'assets' / 'variants'
+    atlas_dir = root / 'assets' / 'atlases'
+    variants_dir.mkdir(parents=True, exist_ok=True)
+    
+    index, ignored = build_sprite_index(assets_dir)
+    for path, reason in ignored:
+        print(f"   ⚠️ Sprite ignoré: {path} ({reason})")
+    
+    sources = [source for animations in index.values() for animation in animations.values()
+               for source in animation['frames'].values()]
+    sizes = set()
+    for source in sources:
+        with Image.open(source) as img:
+            sizes.add(img.size)
+    labels, skipped = supported_labels(sizes, labels, base)
+    for label in skipped:
+        print(f"   ⏭️ {label} écartée: sources trop petites pour {label} sans agrandissement")
+        for stale in (variants_dir / label, atlas_dir / label):
+            if stale.is_dir():
+                shutil.rmtree(stale)
+    
+    tasks = []
+    for character, animations in sorted(index.items()):
+        for animation in animations.values():
+            for source in animation['frames'].values():
+                relative = Path(source).relative_to(assets_dir)
+                tasks.append((source, [(label, variants_dir / label / relative) for label in labels]))
+    
+    params = {'labels': sorted(labels), 'base': base}
+    manifest = load_manifest(variants_dir)
+    todo, cached, hashes = split_cached_tasks(manifest, tasks, params, force)
+    print(f"🎨 {len(tasks)} frames × {len(labels)} échelles ({len(cached)} frames déjà à jour)")
+    
+    results = run_batch(build_frame_variants, [task + (base,) for task in todo], jobs)
+    record_tasks(manifest, todo, hashes, results, params)
+    save_manifest(manifest, variants_dir)
+    
+    # Atlas par échelle, pour les personnages dont une frame a changé
+    changed = {Path(task[0]).relative_to(assets_dir).parts[0] for task in todo}
+    for label in labels:
+        label_index, _ = build_sprite_index(variants_dir / label)
+        for character in sorted(label_index):
+            if character in changed or not atlas_matches(atlas_dir / label / f"{character}.json", trim):
+                pack_character(label_index, character, atlas_dir / label, padding, trim=trim)
+    
+    variant_index = write_variant_index(variants_dir, atlas_dir, labels, base, root)
+    
+    print(f"\n📊 {sum(results)}/{len(todo)} frames refaites, index: {variants_dir / INDEX_FILENAME}")
+    return variant_index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Variantes 1x/2x/0.5x des frames et des atlas")
+    parser.add_argument('--root', default='.',
+                        help="Dossier du jeu (contenant assets/characters)")
+    parser.add_argument('--scales', nargs='+', choices=list(VARIANT_SCALES), default=list(VARIANT_SCALES),
+                        help="Échelles à produire")
+    parser.add_argument('--padding', type=int, default=1,
+                        help="Marge transparente entre les frames des atlas (pixels)")
+    parser.add_argument('--trim', action='store_true',
+                        help="Atlas de frames recadrées sur leur contenu (décalages dans la carte JSON)")
+    parser.add_argument('--force', action='store_true',
+                        help="Tout refaire en ignorant le cache")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
+    build_variants(args.root, args.scales, args.jobs, args.force, args.padding, trim=args.trim)
@@ -7,21 +7,20 @@ Script de vérification des animations multi-frames
 import os
 from pathlib import Path
 
+from sprite_index import build_sprite_index
+from sprite_schema import load_sprite_schema, frame_filenames
+from validate_sprites import read_png_info
+
 def check_animations():
     """Vérifie que toutes les animations sont présentes"""
     
     assets_dir = Path('./assets/characters')
     
-    # Configuration des animations attendues
-    expected_animations = {
-        'ninja': {
-            'idle': 4,   # 4 frames
-            'walk': 6,   # 6 frames
-            'jump': 4,   # 4 frames
-            'attack': 4, # 4 frames
-            'hurt': 2    # 2 frames
-        }
-    }
+    # Un seul parcours de assets/characters/<perso>/<catégorie>/
+    index, ignored = build_sprite_index(assets_dir)
+    
+    # Animations attendues: schéma partagé avec le jeu (sprite_schema.json)
+    expected_animations = load_sprite_schema()['characters']
     
     print("🎬 Vérification des animations multi-frames...")
     print("=" * 50)
@@ -33,17 +32,19 @@ def check_animations():
     for character, animations in expected_animations.items():
         print(f"\n🥷 {character.upper()}:")
         
-        for anim_name, frame_count in animations.items():
+        for anim_name, config in animations.items():
             print(f"  📋 {anim_name}: ", end="")
             
+            frames = index.get(character, {}).get(anim_name, {}).get('frames', {})
+            expected = frame_filenames(character, anim_name, config)
+            frame_count = len(expected)
             frames_found = 0
-            for i in range(1, frame_count + 1):
-                filename = f"{character}_{anim_name}{i}.png"
-                filepath = assets_dir / filename
+            for i, filename in expected:
+                filepath = assets_dir / character / config['category'] / filename
                 
                 total_expected += 1
                 
-                if filepath.exists():
+                if i in frames:
                     frames_found += 1
                     total_found += 1
                 else:
@@ -67,30 +68,25 @@ def check_animations():
     else:
         print(f"\n🎉 Toutes les animations sont présentes !")
     
-    # Vérifier les tailles d'images
+    # Vérifier les tailles d'images (lues dans l'en-tête PNG, sans décodage)
     print(f"\n🔍 Vérification des tailles...")
-    try:
-        from PIL import Image
-        
-        size_issues = []
-        for png_file in assets_dir.glob("ninja_*.png"):
-            if png_file.name.startswith('ninja_'):
-                try:
-                    with Image.open(png_file) as img:
-                        if img.size != (80, 80):
-                            size_issues.append(f"{png_file.name}: {img.size}")
-                except Exception as e:
-                    size_issues.append(f"{png_file.name}: Error - {e}")
-        
-        if size_issues:
-            print(f"⚠️ Problèmes de taille détectés:")
-            for issue in size_issues:
-                print(f"   - {issue}")
-        else:
-            print(f"✅ Toutes les images sont à la bonne taille (80x80)")
-            
-    except ImportError:
-        print(f"⚠️ PIL non disponible pour vérifier les tailles")
+    size_issues = []
+    for animation in (anim for character in expected_animations
+                      for anim in index.get(character, {}).values()):
+        for png_file in map(Path, animation['frames'].values()):
+            try:
+                info = read_png_info(png_file)
+                if (info['width'], info['height']) != (80, 80):
+                    size_issues.append(f"{png_file.name}: ({info['width']}, {info['height']})")
+            except Exception as e:
+                size_issues.append(f"{png_file.name}: Error - {e}")
+    
+    if size_issues:
+        print(f"⚠️ Problèmes de taille détectés:")
+        for issue in sorted(size_issues):
+            print(f"   - {issue}")
+    else:
+        print(f"✅ Toutes les images sont à la bonne taille (80x80)")
     
     print("\n🎮 Prêt pour les animations multi-frames !")
     return total_found == total_expected
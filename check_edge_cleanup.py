@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 Vérification du nettoyage des bords vectorisé
+Compare count_opaque_neighbors et cleanup_edges à l'ancienne boucle
+pixel par pixel (référence ci-dessous) sur des masques alpha aléatoires,
+bords et images d'une ligne ou d'une colonne compris. Le résultat doit
+être identique au bit près.
+"""
+
+import sys
+import argparse
+import numpy as np
+
+from clean_sprites_advanced import count_opaque_neighbors, cleanup_edges, DEFAULT_CLEANING_PARAMS
+
+# Tailles testées (hauteur, largeur): cas limites puis tailles quelconques
+EDGE_CASE_SHAPES = [(1, 1), (1, 7), (7, 1), (2, 2), (3, 3), (80, 80), (37, 113)]
+
+def reference_neighbors(alpha, opaque_threshold=200):
+    """Ancienne boucle: voisins opaques (fenêtre 3x3, pixel compris)"""
+    
+    height, width = alpha.shape
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for y in range(height):
+        for x in range(width):
+            neighbors_opaque = 0
+            for dy in [-1, 0, 1]:
+                for dx in [-1, 0, 1]:
+                    ny, nx = y + dy, x + dx
+                    if 0 <= ny < height and 0 <= nx < width:
+                        if alpha[ny, nx] > opaque_threshold:
+                            neighbors_opaque += 1
+            counts[y, x] = neighbors_opaque
+    return counts
+
+def reference_cleanup_edges(data, min_neighbors=3):
+    """Ancienne boucle de clean_sprite_advanced, modifiant data en place"""
+    
+    edge_mask = (data[:,:,3] > 0) & (data[:,:,3] < 128)
+    for y in range(data.shape[0]):
+        for x in range(data.shape[1]):
+            if edge_mask[y, x]:
+                neighbors_opaque = 0
+                for dy in [-1, 0, 1]:
+                    for dx in [-1, 0, 1]:
+                        ny, nx = y + dy, x + dx
+                        if 0 <= ny < data.shape[0] and 0 <= nx < data.shape[1]:
+                            if data[ny, nx, 3] > 200:
+                                neighbors_opaque += 1
+                
+                if neighbors_opaque < min_neighbors:
+                    data[y, x, 3] = 0
+    return data
+
+def random_sprite(rng, height, width):
+    """RGBA aléatoire dont l'alpha mélange transparent, semi-transparent et opaque"""
+    
+    data = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+    levels = np.array([0, 0, 60, 127, 128, 200, 201, 255], dtype=np.uint8)
+    data[:,:,3] = levels[rng.integers(0, len(levels), (height, width))]
+    return data
+
+def check_edge_cleanup(cases=200, seed=0):
+    """Retourne (tailles testées, liste des écarts vide si tout est identique)"""
+    
+    rng = np.random.default_rng(seed)
+    shapes = list(EDGE_CASE_SHAPES)
+    shapes += [tuple(rng.integers(1, 64, 2)) for _ in range(cases)]
+    params = dict(DEFAULT_CLEANING_PARAMS)
+    
+    failures = []
+    for height, width in shapes:
+        data = random_sprite(rng, height, width)
+        
+        if not np.array_equal(count_opaque_neighbors(data[:,:,3]), reference_neighbors(data[:,:,3])):
+            failures.append(f"count_opaque_neighbors {height}x{width}")
+        
+        expected = reference_cleanup_edges(data.copy(), params['edge_min_neighbors'])
+        if not np.array_equal(cleanup_edges(data.copy(), params), expected):
+            failures.append(f"cleanup_edges {height}x{width}")
+    
+    return shapes, failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare le nettoyage des bords vectorisé à l'ancienne boucle")
+    parser.add_argument('--cases', type=int, default=200,
+                        help="Nombre de tailles aléatoires en plus des cas limites")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Graine des masques aléatoires")
+    args = parser.parse_args()
+    
+    print("🧪 NETTOYAGE DES BORDS: VECTORISÉ vs BOUCLE")
+    print("=" * 50)
+    
+    shapes, failures = check_edge_cleanup(args.cases, args.seed)
+    if failures:
+        print(f"❌ {len(failures)} écart(s):")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print(f"✅ {len(shapes)} masques identiques au bit près")
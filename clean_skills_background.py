@@ -1,18 +1,106 @@
 from PIL import Image
+import numpy as np
+import argparse
 import os
 
-def remove_background_skills():
-    """Supprime le background des sprites spéciaux et les rend transparents"""
+# Nombre de lignes traitées à la fois par la méthode numpy (borne la mémoire)
+ROWS_PER_BLOCK = 512
+
+def skill_background_mask(data):
+    """Masque des pixels de background (bleu/cyan, blanc, gris très clair)"""
+    
+    # int16 pour éviter les débordements de uint8 dans les différences
+    r = data[:,:,0].astype(np.int16)
+    g = data[:,:,1].astype(np.int16)
+    b = data[:,:,2].astype(np.int16)
+    
+    # Background bleu/cyan
+    is_blue = (b > 150) & (b > r + 50) & (b > g + 50)
+    
+    # Background blanc/gris clair
+    is_white = (r > 240) & (g > 240) & (b > 240)
+    
+    # Background très clair (proche du blanc)
+    is_light = (
+        (r > 200) & (g > 200) & (b > 200) &
+        (np.abs(r - g) < 30) & (np.abs(r - b) < 30) & (np.abs(g - b) < 30)
+    )
+    
+    return is_blue | is_white | is_light
+
+def remove_background_numpy(img):
+    """Rend transparent le background d'une image RGBA (version numpy)"""
+    
+    data = np.array(img)
     
-    skills_path = "assets/characters/skills/"
+    # Traitement par blocs de lignes pour les très grandes planches
+    for top in range(0, data.shape[0], ROWS_PER_BLOCK):
+        block = data[top:top + ROWS_PER_BLOCK]
+        block[skill_background_mask(block)] = 0
+    
+    return Image.fromarray(data, 'RGBA')
+
+def remove_background_pixels(img):
+    """Rend transparent le background d'une image RGBA (pixel par pixel)"""
+    
+    # Créer une nouvelle image avec canal alpha
+    new_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    
+    # Parcourir tous les pixels
+    pixels = img.load()
+    new_pixels = new_img.load()
+    
+    for y in range(img.height):
+        for x in range(img.width):
+            r, g, b, a = pixels[x, y]
+            
+            # Détecter les couleurs de background à supprimer
+            is_background = False
+            
+            # Background bleu/cyan
+            if (b > 150 and b > r + 50 and b > g + 50):
+                is_background = True
+            
+            # Background blanc/gris clair
+            elif (r > 240 and g > 240 and b > 240):
+                is_background = True
+            
+            # Background très clair (proche du blanc)
+            elif (r > 200 and g > 200 and b > 200 and
+                  abs(r-g) < 30 and abs(r-b) < 30 and abs(g-b) < 30):
+                is_background = True
+            
+            # Si ce n'est pas du background, garder le pixel
+            if not is_background:
+                new_pixels[x, y] = (r, g, b, a)
+            # Sinon, le rendre transparent
+            else:
+                new_pixels[x, y] = (0, 0, 0, 0)
+    
+    return new_img
+
+BACKGROUND_METHODS = {
+    'numpy': remove_background_numpy,
+    'pixels': remove_background_pixels,
+}
+
+def remove_background_skills(method='numpy', skills_path="assets/characters/skills/"):
+    """Supprime le background des sprites spéciaux et les rend transparents
+    
+    method: 'numpy' (vectorisé, par blocs de lignes) ou 'pixels' (boucle
+    pixel par pixel d'origine, même résultat)
+    """
     
     if not os.path.exists(skills_path):
         print(f"❌ Dossier {skills_path} non trouvé")
-        return
+        return 0
+    
+    remove_background = BACKGROUND_METHODS[method]
     
     print("🧹 Suppression des backgrounds des sprites spéciaux...")
     
     sprite_files = [f for f in os.listdir(skills_path) if f.endswith('.png')]
+    cleaned_count = 0
     
     for filename in sprite_files:
         filepath = os.path.join(skills_path, filename)
@@ -21,50 +109,26 @@ def remove_background_skills():
             # Ouvrir l'image
             img = Image.open(filepath).convert("RGBA")
             
-            # Créer une nouvelle image avec canal alpha
-            new_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
-            
-            # Parcourir tous les pixels
-            pixels = img.load()
-            new_pixels = new_img.load()
-            
-            for y in range(img.height):
-                for x in range(img.width):
-                    r, g, b, a = pixels[x, y]
-                    
-                    # Détecter les couleurs de background à supprimer
-                    is_background = False
-                    
-                    # Background bleu/cyan
-                    if (b > 150 and b > r + 50 and b > g + 50):
-                        is_background = True
-                    
-                    # Background blanc/gris clair
-                    elif (r > 240 and g > 240 and b > 240):
-                        is_background = True
-                    
-                    # Background très clair (proche du blanc)
-                    elif (r > 200 and g > 200 and b > 200 and 
-                          abs(r-g) < 30 and abs(r-b) < 30 and abs(g-b) < 30):
-                        is_background = True
-                    
-                    # Si ce n'est pas du background, garder le pixel
-                    if not is_background:
-                        new_pixels[x, y] = (r, g, b, a)
-                    # Sinon, le rendre transparent
-                    else:
-                        new_pixels[x, y] = (0, 0, 0, 0)
+            new_img = remove_background(img)
             
             # Sauvegarder avec transparence
             new_img.save(filepath, 'PNG', optimize=True)
             
             print(f"✅ {filename}: Background supprimé")
-            
+            cleaned_count += 1
+        
         except Exception as e:
             print(f"❌ Erreur avec {filename}: {e}")
     
     print("\n🎉 Nettoyage terminé !")
     print("🎯 Les sprites spéciaux sont maintenant transparents")
+    
+    return cleaned_count
 
 if __name__ == "__main__":
-    remove_background_skills()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Suppression du background des sprites spéciaux")
+    parser.add_argument('--method', default='numpy', choices=list(BACKGROUND_METHODS),
+                        help="numpy (rapide, grandes planches) ou pixels (boucle d'origine)")
+    args = parser.parse_args()
+    
+    remove_background_skills(args.method)
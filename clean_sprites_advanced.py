@@ -6,148 +6,466 @@ Script pour nettoyer complètement les sprites et supprimer tous les artefacts
 """
 
 import os
+import argparse
 from pathlib import Path
 import numpy as np
 from PIL import Image, ImageFilter, ImageEnhance
 
+from sprite_batch import run_batch, add_jobs_argument, batch_counts, batch_ok
+from sprite_cache import load_manifest, save_manifest, split_cached_tasks, record_tasks
+from sprite_tiles import map_strips, process_strips
+from image_cache import load_image
+from sprite_timing import stage, run_timed, timing_report, profile_call
+from validate_sprites import check_sprite_files
+from sprite_index import build_sprite_index, frame_tasks
+
 def analyze_sprite_edges(image_path):
     """Analyse les bords du sprite pour détecter les artefacts"""
     
-    with Image.open(image_path).convert("RGBA") as img:
-        data = np.array(img)
-        
-        print(f"\n🔍 Analyse de {Path(image_path).name}:")
-        print(f"   Taille: {img.size}")
-        
-        # Analyser les coins
-        corners = {
-            'top-left': data[0, 0],
-            'top-right': data[0, -1],
-            'bottom-left': data[-1, 0],
-            'bottom-right': data[-1, -1]
-        }
-        
-        for corner, color in corners.items():
-            r, g, b, a = color
-            print(f"   {corner}: RGBA({r}, {g}, {b}, {a})")
-        
-        # Détecter les pixels blancs/gris clairs
-        white_pixels = np.sum((data[:,:,0] > 240) & (data[:,:,1] > 240) & (data[:,:,2] > 240) & (data[:,:,3] > 0))
-        total_pixels = data.shape[0] * data.shape[1]
-        
-        print(f"   Pixels blancs: {white_pixels}/{total_pixels} ({white_pixels/total_pixels*100:.1f}%)")
-        
-        return corners, white_pixels
+    img = load_image(image_path)
+    data = np.array(img)
+    
+    print(f"\n🔍 Analyse de {Path(image_path).name}:")
+    print(f"   Taille: {img.size}")
+    
+    # Analyser les coins
+    corners = {
+        'top-left': data[0, 0],
+        'top-right': data[0, -1],
+        'bottom-left': data[-1, 0],
+        'bottom-right': data[-1, -1]
+    }
+    
+    for corner, color in corners.items():
+        r, g, b, a = color
+        print(f"   {corner}: RGBA({r}, {g}, {b}, {a})")
+    
+    # Détecter les pixels blancs/gris clairs
+    white_pixels = np.sum((data[:,:,0] > 240) & (data[:,:,1] > 240) & (data[:,:,2] > 240) & (data[:,:,3] > 0))
+    total_pixels = data.shape[0] * data.shape[1]
+    
+    print(f"   Pixels blancs: {white_pixels}/{total_pixels} ({white_pixels/total_pixels*100:.1f}%)")
+    
+    return corners, white_pixels
 
-def clean_sprite_advanced(input_path, output_path):
-    """Nettoyage avancé d'un sprite"""
+def count_opaque_neighbors(alpha, opaque_threshold=200):
+    """Compte les voisins opaques (fenêtre 3x3) de chaque pixel en une passe"""
     
-    with Image.open(input_path).convert("RGBA") as img:
-        data = np.array(img)
-        
-        print(f"\n🧹 Nettoyage de {Path(input_path).name}...")
-        
-        # 1. Détecter la couleur de fond dominante dans les coins
-        corners = [
-            data[0, 0],      # top-left
-            data[0, -1],     # top-right  
-            data[-1, 0],     # bottom-left
-            data[-1, -1]     # bottom-right
-        ]
-        
-        # Couleurs à supprimer (fond + blanc/gris clair)
-        colors_to_remove = []
-        
-        # Ajouter les couleurs des coins si elles sont uniformes
-        for corner in corners:
-            r, g, b, a = corner
-            if a > 0:  # Si pas déjà transparent
-                colors_to_remove.append((r, g, b))
-        
-        # Ajouter toutes les nuances de blanc/gris clair
-        for threshold in [255, 250, 245, 240, 235, 230, 220, 210]:
-            colors_to_remove.append((threshold, threshold, threshold))
-        
-        print(f"   Couleurs à supprimer: {len(colors_to_remove)}")
-        
-        # 2. Supprimer les couleurs de fond avec tolérance
-        tolerance = 20
-        
-        for r_target, g_target, b_target in colors_to_remove:
-            # Créer un masque pour les pixels similaires
-            mask = (
-                (np.abs(data[:,:,0].astype(int) - r_target) <= tolerance) &
-                (np.abs(data[:,:,1].astype(int) - g_target) <= tolerance) &
-                (np.abs(data[:,:,2].astype(int) - b_target) <= tolerance)
-            )
-            
-            # Rendre ces pixels transparents
-            data[mask, 3] = 0
-        
-        # 3. Nettoyage des contours (anti-aliasing indésirable)
-        # Supprimer les pixels semi-transparents aux bords
-        edge_mask = (data[:,:,3] > 0) & (data[:,:,3] < 128)  # Pixels semi-transparents
-        
-        # Vérifier si ces pixels sont aux bords ou isolés
-        for y in range(data.shape[0]):
-            for x in range(data.shape[1]):
-                if edge_mask[y, x]:
-                    # Compter les voisins opaques
-                    neighbors_opaque = 0
-                    for dy in [-1, 0, 1]:
-                        for dx in [-1, 0, 1]:
-                            ny, nx = y + dy, x + dx
-                            if 0 <= ny < data.shape[0] and 0 <= nx < data.shape[1]:
-                                if data[ny, nx, 3] > 200:  # Voisin opaque
-                                    neighbors_opaque += 1
-                    
-                    # Si moins de 3 voisins opaques, supprimer le pixel
-                    if neighbors_opaque < 3:
-                        data[y, x, 3] = 0
-        
-        # 4. Améliorer le contraste du sprite restant
-        # Seulement sur les pixels non-transparents
-        opaque_mask = data[:,:,3] > 128
-        
-        if np.any(opaque_mask):
-            # Augmenter légèrement le contraste
-            for c in range(3):  # RGB
-                channel = data[:,:,c][opaque_mask].astype(float)
-                if len(channel) > 0:
-                    # Normaliser et améliorer le contraste
-                    channel = np.clip(channel * 1.1 - 5, 0, 255)
-                    data[:,:,c][opaque_mask] = channel.astype(np.uint8)
-        
-        # 5. Redimensionner proprement à 80x80
-        cleaned_img = Image.fromarray(data, 'RGBA')
-        
-        # Redimensionnement avec anti-aliasing de qualité
-        resized_img = cleaned_img.resize((80, 80), Image.Resampling.LANCZOS)
-        
-        # 6. Post-traitement final - supprimer les artefacts de redimensionnement
-        final_data = np.array(resized_img)
-        
-        # Supprimer les pixels très faiblement opaques créés par le redimensionnement
-        weak_alpha_mask = (final_data[:,:,3] > 0) & (final_data[:,:,3] < 50)
-        final_data[weak_alpha_mask, 3] = 0
-        
-        # Renforcer les pixels moyennement opaques
-        medium_alpha_mask = (final_data[:,:,3] >= 50) & (final_data[:,:,3] < 200)
-        final_data[medium_alpha_mask, 3] = 255
-        
-        final_img = Image.fromarray(final_data, 'RGBA')
-        final_img.save(output_path, 'PNG', optimize=True)
+    opaque = (alpha > opaque_threshold).astype(np.uint8)
+    
+    # Filtre boîte 3x3: somme des 9 décalages d'un masque entouré de zéros
+    padded = np.pad(opaque, 1, mode='constant')
+    height, width = opaque.shape
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            counts += padded[dy:dy + height, dx:dx + width]
+    
+    return counts
+
+# Paramètres par défaut du moteur de nettoyage (surchargés par les profils)
+DEFAULT_CLEANING_PARAMS = {
+    'tolerance': 20,            # Tolérance des couleurs de fond (coins + gris)
+    'gray_levels': [255, 250, 245, 240, 235, 230, 220, 210],
+    'white_threshold': 240,     # Seuil des pixels blancs
+    'gray_threshold': 220,      # Seuil des gris très clairs
+    'edge_min_neighbors': 3,    # Voisins opaques minimum d'un pixel de bord
+    'crop_alpha': 50,           # Opacité minimum du contenu pour le crop
+    'crop_padding': 2,          # Marge conservée autour du contenu
+    'target_size': 80,          # Taille finale (carrée)
+    'sharpness': 1.2,           # Facteur de netteté
+}
+
+# Étapes du moteur, dans leur ordre d'exécution
+CLEANING_STAGES = [
+    'corner_background',  # Suppression du fond détecté dans les coins
+    'white_gray',         # Suppression des blancs / gris clairs
+    'edge_cleanup',       # Suppression des pixels semi-transparents isolés
+    'contrast',           # Amélioration du contraste
+    'auto_crop',          # Crop automatique des bordures vides
+    'fit',                # Redimensionnement centré en 80x80
+    'sharpen',            # Amélioration de la netteté
+    'post_alpha',         # Nettoyage de l'alpha après redimensionnement
+]
+
+# Profils de nettoyage, du moins coûteux au plus complet
+CLEANING_PROFILES = {
+    'rapide': {
+        'stages': ['white_gray', 'auto_crop', 'fit'],
+    },
+    'standard': {
+        'stages': ['white_gray', 'auto_crop', 'fit', 'sharpen'],
+    },
+    'complet': {
+        'stages': list(CLEANING_STAGES),
+    },
+}
+
+# Étapes qui retirent des pixels de fond: seules elles peuvent réduire
+# background_residue d'un profil au suivant
+BACKGROUND_STAGES = {'corner_background', 'white_gray', 'edge_cleanup', 'post_alpha'}
+
+def auto_profiles():
+    """Profils essayés par 'auto', du moins au plus coûteux
+    
+    Un profil n'est retenu que s'il ajoute au précédent une étape de
+    BACKGROUND_STAGES: 'standard' (rapide + sharpen) ne peut pas retirer
+    de résidu que 'rapide' aurait laissé.
+    """
+    
+    profiles, removed = [], set()
+    for name, profile in CLEANING_PROFILES.items():
+        background = BACKGROUND_STAGES.intersection(profile['stages'])
+        if not background <= removed:
+            profiles.append(name)
+            removed |= background
+    return profiles
+
+def get_cleaning_profile(profile):
+    """Retourne les étapes et paramètres complets d'un profil"""
+    
+    if isinstance(profile, str):
+        if profile not in CLEANING_PROFILES:
+            raise ValueError(f"Profil de nettoyage inconnu: {profile}")
+        profile = CLEANING_PROFILES[profile]
+    
+    unknown_stages = [stage for stage in profile['stages'] if stage not in CLEANING_STAGES]
+    if unknown_stages:
+        raise ValueError(f"Étapes inconnues: {', '.join(unknown_stages)}")
+    
+    params = dict(DEFAULT_CLEANING_PARAMS)
+    params.update(profile.get('params', {}))
+    
+    stages = [stage for stage in CLEANING_STAGES if stage in profile['stages']]
+    return stages, params
+
+# Nombre de pixels traités par bloc de lignes (borne la mémoire temporaire)
+MASK_BLOCK_PIXELS = 1 << 20
+
+def build_color_mask(data, colors, tolerance):
+    """Masque des pixels proches (par canal, ± tolérance) d'une des couleurs
+    
+    Chaque canal passe par une table de correspondance 256 entrées dont les
+    bits indiquent les couleurs compatibles avec la valeur du canal: un pixel
+    est retiré si le ET des trois tables garde au moins un bit. L'image est
+    parcourue une seule fois, par blocs de lignes.
+    """
+    
+    height, width = data.shape[:2]
+    mask = np.zeros((height, width), dtype=bool)
+    
+    values = np.arange(256)
+    
+    # 64 couleurs maximum par table (un bit par couleur)
+    for start in range(0, len(colors), 64):
+        group = colors[start:start + 64]
+        dtype = np.uint16 if len(group) <= 16 else np.uint64
         
-        # Statistiques
-        original_pixels = np.sum(np.array(Image.open(input_path).convert("RGBA"))[:,:,3] > 0)
-        final_pixels = np.sum(final_data[:,:,3] > 0)
+        luts = np.zeros((3, 256), dtype=dtype)
+        for bit, color in enumerate(group):
+            for c in range(3):
+                near = np.abs(values - int(color[c])) <= tolerance
+                luts[c, near] |= dtype(1 << bit)
         
-        print(f"   ✅ Nettoyé: {original_pixels} → {final_pixels} pixels opaques")
+        rows_per_block = max(1, MASK_BLOCK_PIXELS // max(1, width))
+        for top in range(0, height, rows_per_block):
+            block = data[top:top + rows_per_block]
+            combined = luts[0][block[:,:,0]]
+            combined &= luts[1][block[:,:,1]]
+            combined &= luts[2][block[:,:,2]]
+            mask[top:top + rows_per_block] |= combined != 0
+    
+    return mask
+
+def remove_corner_background(data, params):
+    """Supprime les couleurs de fond des coins et les nuances de gris clair"""
+    
+    # Couleurs à supprimer (fond + blanc/gris clair)
+    colors_to_remove = []
+    
+    # Coins de l'image entière (fournis par le mode par bandes) ou de data
+    corners = params.get('corners')
+    if corners is None:
+        corners = (data[0, 0], data[0, -1], data[-1, 0], data[-1, -1])
+    
+    # Ajouter les couleurs des coins si elles ne sont pas déjà transparentes
+    for corner in corners:
+        r, g, b, a = corner
+        if a > 0:
+            colors_to_remove.append((r, g, b))
+    
+    # Ajouter toutes les nuances de blanc/gris clair
+    for level in params['gray_levels']:
+        colors_to_remove.append((level, level, level))
+    
+    # Un seul masque combiné pour toutes les couleurs
+    mask = build_color_mask(data, colors_to_remove, params['tolerance'])
+    data[mask, 3] = 0
+    
+    return data
+
+def background_residue(data, corners, params):
+    """Pixels visibles encore proches du fond (couleurs des coins de la
+    source et nuances de gris clair, à la tolérance près)
+    
+    C'est ce que corner_background retire: un profil qui ne l'applique pas
+    laisse ici les halos de la couleur de fond autour du personnage.
+    """
+    
+    colors = [(r, g, b) for r, g, b, a in corners if a > 0]
+    colors += [(level, level, level) for level in params['gray_levels']]
+    mask = build_color_mask(data, colors, params['tolerance'])
+    return int(np.sum(mask & (data[:,:,3] > 0)))
+
+def remove_white_gray(data, params):
+    """Rend transparents les pixels blancs et gris très clairs"""
+    
+    white_threshold = params['white_threshold']
+    is_white = (
+        (data[:,:,0] >= white_threshold) & 
+        (data[:,:,1] >= white_threshold) & 
+        (data[:,:,2] >= white_threshold)
+    )
+    data[is_white] = [0, 0, 0, 0]
+    
+    gray_threshold = params['gray_threshold']
+    is_light_gray = (
+        (data[:,:,0] >= gray_threshold) & 
+        (data[:,:,1] >= gray_threshold) & 
+        (data[:,:,2] >= gray_threshold) &
+        (data[:,:,0] == data[:,:,1]) &  # Vraiment gris (composantes égales)
+        (data[:,:,1] == data[:,:,2])
+    )
+    data[is_light_gray] = [0, 0, 0, 0]
+    
+    return data
+
+def cleanup_edges(data, params):
+    """Supprime les pixels semi-transparents isolés (anti-aliasing indésirable)"""
+    
+    edge_mask = (data[:,:,3] > 0) & (data[:,:,3] < 128)  # Pixels semi-transparents
+    
+    # Compter les voisins opaques de tous les pixels en une seule passe
+    neighbors_opaque = count_opaque_neighbors(data[:,:,3])
+    
+    # Si trop peu de voisins opaques, supprimer le pixel
+    data[edge_mask & (neighbors_opaque < params['edge_min_neighbors']), 3] = 0
+    
+    return data
+
+def enhance_contrast(data, params):
+    """Augmente légèrement le contraste des pixels opaques"""
+    
+    opaque_mask = data[:,:,3] > 128
+    
+    if np.any(opaque_mask):
+        for c in range(3):  # RGB
+            channel = data[:,:,c][opaque_mask].astype(float)
+            channel = np.clip(channel * 1.1 - 5, 0, 255)
+            data[:,:,c][opaque_mask] = channel.astype(np.uint8)
+    
+    return data
+
+def auto_crop(data, params):
+    """Crop automatique pour enlever les bordures vides"""
+    
+    alpha_mask = data[:,:,3] > params['crop_alpha']
+    
+    if not np.any(alpha_mask):
+        print("   ⚠️ Image entièrement transparente!")
+        return data
+    
+    # Trouver les limites du contenu
+    rows = np.any(alpha_mask, axis=1)
+    cols = np.any(alpha_mask, axis=0)
+    top, bottom = np.where(rows)[0][[0, -1]]
+    left, right = np.where(cols)[0][[0, -1]]
+    
+    # Ajouter un petit padding
+    padding = params['crop_padding']
+    top = max(0, top - padding)
+    left = max(0, left - padding)
+    bottom = min(data.shape[0] - 1, bottom + padding)
+    right = min(data.shape[1] - 1, right + padding)
+    
+    print(f"   ✂️ Crop: {right-left+1}x{bottom-top+1}")
+    return data[top:bottom+1, left:right+1]
+
+def fit_to_target(data, params):
+    """Redimensionne en gardant les proportions et centre sur un canvas carré"""
+    
+    target_size = params['target_size']
+    cropped_img = Image.fromarray(data, 'RGBA')
+    
+    # Calculer les dimensions finales en gardant les proportions
+    original_w, original_h = cropped_img.size
+    aspect_ratio = original_w / original_h
+    
+    if aspect_ratio > 1:  # Plus large que haut
+        new_w = target_size
+        new_h = int(target_size / aspect_ratio)
+    else:  # Plus haut que large
+        new_h = target_size
+        new_w = int(target_size * aspect_ratio)
+    
+    # Redimensionner avec antialiasing
+    resized = cropped_img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+    
+    # Centrer sur un canvas transparent
+    final_img = Image.new('RGBA', (target_size, target_size), (0, 0, 0, 0))
+    paste_x = (target_size - new_w) // 2
+    paste_y = (target_size - new_h) // 2
+    final_img.paste(resized, (paste_x, paste_y), resized)
+    
+    print(f"   📐 Redimensionné: {new_w}x{new_h} → {target_size}x{target_size}")
+    return np.array(final_img)
+
+def sharpen(data, params):
+    """Améliore la netteté"""
+    
+    enhancer = ImageEnhance.Sharpness(Image.fromarray(data, 'RGBA'))
+    return np.array(enhancer.enhance(params['sharpness']))
+
+def cleanup_resized_alpha(data, params):
+    """Supprime les artefacts d'alpha créés par le redimensionnement"""
+    
+    # Supprimer les pixels très faiblement opaques
+    weak_alpha_mask = (data[:,:,3] > 0) & (data[:,:,3] < 50)
+    data[weak_alpha_mask, 3] = 0
+    
+    # Renforcer les pixels moyennement opaques
+    medium_alpha_mask = (data[:,:,3] >= 50) & (data[:,:,3] < 200)
+    data[medium_alpha_mask, 3] = 255
+    
+    return data
+
+# Fonction associée à chaque étape du moteur
+STAGE_FUNCTIONS = {
+    'corner_background': remove_corner_background,
+    'white_gray': remove_white_gray,
+    'edge_cleanup': cleanup_edges,
+    'contrast': enhance_contrast,
+    'auto_crop': auto_crop,
+    'fit': fit_to_target,
+    'sharpen': sharpen,
+    'post_alpha': cleanup_resized_alpha,
+}
+
+# Étape de nettoyage → étape rapportée dans les temps par étape
+TIMING_STAGES = {
+    'corner_background': 'background_mask',
+    'white_gray': 'background_mask',
+    'edge_cleanup': 'edge_cleanup',
+    'contrast': 'contrast',
+    'auto_crop': 'resize',
+    'fit': 'resize',
+    'sharpen': 'resize',
+    'post_alpha': 'post_alpha',
+}
+
+def run_cleaning_stages(data, profile='standard'):
+    """Applique les étapes d'un profil de nettoyage à un array RGBA"""
+    
+    stages, params = get_cleaning_profile(profile)
+    
+    for name in stages:
+        with stage(TIMING_STAGES[name]):
+            data = STAGE_FUNCTIONS[name](data, params)
+    
+    return data
+
+# Étapes qui ne dépendent que du pixel ou de ses 8 voisins: applicables
+# bande par bande (1 ligne de recouvrement pour edge_cleanup)
+STRIP_STAGES = {'corner_background', 'white_gray', 'edge_cleanup', 'contrast'}
+
+def content_box(img, min_alpha, max_memory=None):
+    """Boîte (gauche, haut, droite, bas) des pixels d'alpha > min_alpha, ou None"""
+    
+    def strip_bounds(strip, top):
+        mask = strip[:,:,3] > min_alpha
+        if not np.any(mask):
+            return None
+        rows = np.where(np.any(mask, axis=1))[0]
+        cols = np.where(np.any(mask, axis=0))[0]
+        return cols[0], top + rows[0], cols[-1], top + rows[-1]
+    
+    bounds = [b for b in map_strips(img, strip_bounds, max_memory) if b is not None]
+    if not bounds:
+        return None
+    return (min(b[0] for b in bounds), min(b[1] for b in bounds),
+            max(b[2] for b in bounds), max(b[3] for b in bounds))
+
+def run_cleaning_stages_tiled(img, profile='standard', max_memory=None):
+    """Applique un profil à une image RGBA en bornant la mémoire de travail
+    
+    Les premières étapes locales (STRIP_STAGES) sont appliquées bande par
+    bande directement dans img; un auto_crop qui suit est calculé sur les
+    bandes, puis le reste du profil travaille sur la zone recadrée.
+    """
+    
+    stages, params = get_cleaning_profile(profile)
+    
+    # Couleurs des coins de l'image entière, pas de chaque bande
+    params['corners'] = [img.getpixel(xy) for xy in
+                         ((0, 0), (img.width - 1, 0), (0, img.height - 1), (img.width - 1, img.height - 1))]
+    
+    local = 0
+    while local < len(stages) and stages[local] in STRIP_STAGES:
+        local += 1
+    
+    if local:
+        def apply_local(strip, above):
+            for name in stages[:local]:
+                with stage(TIMING_STAGES[name]):
+                    strip = STAGE_FUNCTIONS[name](strip, params)
+            return strip
         
-        return True
+        halo = 1 if 'edge_cleanup' in stages[:local] else 0
+        process_strips(img, apply_local, max_memory, halo)
+    
+    remaining = stages[local:]
+    if remaining and remaining[0] == 'auto_crop':
+        with stage(TIMING_STAGES['auto_crop']):
+            box = content_box(img, params['crop_alpha'], max_memory)
+        if box is None:
+            print("   ⚠️ Image entièrement transparente!")
+        else:
+            padding = params['crop_padding']
+            left = max(0, box[0] - padding)
+            top = max(0, box[1] - padding)
+            right = min(img.width - 1, box[2] + padding)
+            bottom = min(img.height - 1, box[3] + padding)
+            print(f"   ✂️ Crop: {right-left+1}x{bottom-top+1}")
+            img = img.crop((left, top, right + 1, bottom + 1))
+        remaining = remaining[1:]
+    
+    data = np.array(img)
+    for name in remaining:
+        with stage(TIMING_STAGES[name]):
+            data = STAGE_FUNCTIONS[name](data, params)
+    
+    return data
 
-def clean_sprite_advanced(image_path, output_path=None):
-    """Nettoie complètement un sprite en supprimant tous les résidus blancs"""
+def cache_params(profile):
+    """Paramètres effectifs d'un profil, pour la clé du cache de construction"""
+    
+    if profile == 'auto':
+        profiles = {name: get_cleaning_profile(name) for name in auto_profiles()}
+        return {'profile': 'auto', 'profiles': profiles}
+    
+    stages, params = get_cleaning_profile(profile)
+    return {'stages': stages, 'params': params}
+
+def clean_sprite_advanced(image_path, output_path=None, profile='standard', max_memory=None):
+    """Nettoie complètement un sprite en supprimant tous les résidus blancs
+    
+    profile: nom d'un profil de CLEANING_PROFILES, dictionnaire de profil,
+    ou 'auto' pour essayer les profils d'auto_profiles du moins au plus
+    coûteux jusqu'à obtenir un sprite sans résidu de fond (voir
+    background_residue).
+    max_memory: budget (octets) de la mémoire de travail; si fourni, les
+    étapes locales sont appliquées par bandes (très grandes planches).
+    """
     
     if output_path is None:
         output_path = image_path
@@ -155,205 +473,138 @@ def clean_sprite_advanced(image_path, output_path=None):
     print(f"🧹 Nettoyage avancé: {image_path}")
     
     try:
-        # Charger l'image
-        with Image.open(image_path) as img:
-            # Convertir en RGBA si nécessaire
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-            
-            # Convertir en array numpy pour traitement
-            data = np.array(img)
-            
-            # Taille originale
-            original_size = data.shape[:2]
-            print(f"   📐 Taille originale: {original_size[1]}x{original_size[0]}")
-            
-            # 1. Supprimer les pixels blancs et quasi-blancs
-            # Définir ce qu'est "blanc" (RGB proche de 255,255,255)
-            white_threshold = 240
-            is_white = (
-                (data[:,:,0] >= white_threshold) & 
-                (data[:,:,1] >= white_threshold) & 
-                (data[:,:,2] >= white_threshold)
-            )
-            
-            # Rendre transparents les pixels blancs
-            data[is_white] = [0, 0, 0, 0]
-            
-            # 2. Supprimer les pixels gris très clairs (résidus)
-            gray_threshold = 220
-            is_light_gray = (
-                (data[:,:,0] >= gray_threshold) & 
-                (data[:,:,1] >= gray_threshold) & 
-                (data[:,:,2] >= gray_threshold) &
-                (data[:,:,0] == data[:,:,1]) &  # Vraiment gris (composantes égales)
-                (data[:,:,1] == data[:,:,2])
-            )
-            data[is_light_gray] = [0, 0, 0, 0]
-            
-            # 3. Detecter les contours et nettoyer
-            # Créer un masque des pixels non-transparents
-            alpha_mask = data[:,:,3] > 50  # Pixels avec un minimum d'opacité
-            
-            # 4. Crop automatique pour enlever les bordures vides
-            if np.any(alpha_mask):
-                # Trouver les limites du contenu
-                rows = np.any(alpha_mask, axis=1)
-                cols = np.any(alpha_mask, axis=0)
-                
-                if np.any(rows) and np.any(cols):
-                    top, bottom = np.where(rows)[0][[0, -1]]
-                    left, right = np.where(cols)[0][[0, -1]]
-                    
-                    # Ajouter un petit padding
-                    padding = 2
-                    top = max(0, top - padding)
-                    left = max(0, left - padding)
-                    bottom = min(data.shape[0] - 1, bottom + padding)
-                    right = min(data.shape[1] - 1, right + padding)
-                    
-                    # Crop l'image
-                    cropped_data = data[top:bottom+1, left:right+1]
-                    print(f"   ✂️ Crop: {right-left+1}x{bottom-top+1}")
-                else:
-                    cropped_data = data
+        # Charger l'image (décodée une seule fois, partagée avec l'analyse)
+        with stage('decode'):
+            source = load_image(image_path)
+            if max_memory is None:
+                source_data = np.array(source)
+        
+        print(f"   📐 Taille originale: {source.width}x{source.height}")
+        
+        profiles = auto_profiles() if profile == 'auto' else [profile]
+        corners = [source.getpixel(xy) for xy in
+                   ((0, 0), (source.width - 1, 0), (0, source.height - 1), (source.width - 1, source.height - 1))]
+        
+        for index, candidate in enumerate(profiles):
+            if max_memory is None:
+                final_data = run_cleaning_stages(source_data.copy(), candidate)
             else:
-                print("   ⚠️ Image entièrement transparente!")
-                cropped_data = data
+                final_data = run_cleaning_stages_tiled(source.copy(), candidate, max_memory)
+            if index == len(profiles) - 1:
+                break
             
-            # 5. Redimensionner à 80x80 avec padding intelligent
-            target_size = 80
-            cropped_img = Image.fromarray(cropped_data, 'RGBA')
-            
-            # Calculer les dimensions finales en gardant les proportions
-            original_w, original_h = cropped_img.size
-            aspect_ratio = original_w / original_h
-            
-            if aspect_ratio > 1:  # Plus large que haut
-                new_w = target_size
-                new_h = int(target_size / aspect_ratio)
-            else:  # Plus haut que large
-                new_h = target_size
-                new_w = int(target_size * aspect_ratio)
-            
-            # Redimensionner avec antialiasing
-            resized = cropped_img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-            
-            # 6. Centrer sur un canvas 80x80 transparent
-            final_img = Image.new('RGBA', (target_size, target_size), (0, 0, 0, 0))
-            
-            # Calculer la position pour centrer
-            paste_x = (target_size - new_w) // 2
-            paste_y = (target_size - new_h) // 2
-            
-            final_img.paste(resized, (paste_x, paste_y), resized)
-            
-            # 7. Post-traitement final
-            # Améliorer la netteté
-            enhancer = ImageEnhance.Sharpness(final_img)
-            final_img = enhancer.enhance(1.2)
-            
-            # 8. Sauvegarder avec compression optimale
-            final_img.save(output_path, 'PNG', optimize=True)
-            
-            print(f"   ✅ Nettoyé et sauvé: {new_w}x{new_h} → 80x80")
-            return True
+            with stage('verify'):
+                residue = background_residue(final_data, corners, get_cleaning_profile(candidate)[1])
+            if residue == 0:
+                break
+            print(f"   🔁 {residue} pixels proches du fond restants, profil suivant...")
+        
+        # Sauvegarder avec compression optimale
+        with stage('encode'):
+            Image.fromarray(final_data, 'RGBA').save(output_path, 'PNG', optimize=True)
+        
+        # Statistiques
+        original_pixels = sum(map_strips(source, lambda strip, top: int(np.sum(strip[:,:,3] > 0)), max_memory))
+        final_pixels = np.sum(final_data[:,:,3] > 0)
+        print(f"   ✅ Nettoyé et sauvé: {original_pixels} → {final_pixels} pixels opaques")
+        return True
             
     except Exception as e:
         print(f"   ❌ Erreur: {e}")
         return False
 
-def clean_all_ninja_sprites():
-    """Nettoie tous les sprites ninja"""
+def clean_all_sprites(profile='standard', jobs=1, force=False, max_memory=None, timings_path=None,
+                      assets_dir='./assets/characters', characters=None):
+    """Nettoie les frames de tous les personnages (profil standard par défaut)
+    
+    Les frames sont lues dans <perso>/<catégorie>/ et écrites au même
+    emplacement sous cleaned/. characters: personnages à traiter (tous si
+    None). Affiche les temps par étape; timings_path: détail par fichier
+    en JSON. Retourne le bilan du lot (voir sprite_batch.batch_counts).
+    """
     
-    print("🎨 NETTOYAGE AVANCÉ DES SPRITES NINJA")
+    print("🎨 NETTOYAGE AVANCÉ DES SPRITES")
     print("=" * 50)
     
-    assets_dir = Path('./assets/characters')
+    assets_dir = Path(assets_dir)
     
     # Créer un dossier pour les sprites nettoyés
     cleaned_dir = assets_dir / 'cleaned'
     cleaned_dir.mkdir(exist_ok=True)
     
-    # Liste des sprites ninja
-    ninja_files = list(assets_dir.glob('ninja_*.png'))
+    # Frames de tous les personnages, en un seul parcours
+    index, ignored = build_sprite_index(assets_dir)
+    for path, reason in ignored:
+        print(f"   ⚠️ Sprite ignoré: {path} ({reason})")
     
-    if not ninja_files:
-        print("❌ Aucun sprite ninja trouvé!")
-        return False
+    # Nettoyer vers le dossier cleaned
+    tasks = [
+        (source, output, profile, max_memory)
+        for source, output in frame_tasks(index, cleaned_dir, characters)
+    ]
     
-    print(f"📁 Trouvé {len(ninja_files)} sprites ninja à nettoyer")
+    if not tasks:
+        print("❌ Aucun sprite trouvé!")
+        return batch_counts(0, 0, [])
     
-    success_count = 0
+    print(f"📁 Trouvé {len(tasks)} sprites à nettoyer")
     
-    for sprite_file in ninja_files:
-        # Nettoyer vers le dossier cleaned
-        output_file = cleaned_dir / sprite_file.name
-        
-        if clean_sprite_advanced(sprite_file, output_file):
-            success_count += 1
+    # Ne retraiter que les sprites dont la source ou le profil a changé
+    params = cache_params(profile)
+    manifest = load_manifest(cleaned_dir)
+    todo, cached, hashes = split_cached_tasks(manifest, tasks, params, force, base=cleaned_dir)
+    if cached:
+        print(f"⏭️ {len(cached)} sprites déjà à jour (cache)")
+    
+    for parent in sorted({task[1].parent for task in todo}):
+        parent.mkdir(parents=True, exist_ok=True)
+    
+    timed = run_batch(run_timed, [(clean_sprite_advanced,) + task for task in todo], jobs)
+    results = [result for result, _ in timed]
+    record_tasks(manifest, todo, hashes, results, params, base=cleaned_dir)
+    save_manifest(manifest, cleaned_dir)
+    
+    timing_report([task[0].name for task in todo], [timings for _, timings in timed], timings_path)
+    
+    success_count = len(cached) + sum(results)
     
     print(f"\n📊 RÉSULTATS:")
-    print(f"   ✅ Sprites nettoyés: {success_count}/{len(ninja_files)}")
+    print(f"   ✅ Sprites nettoyés: {success_count}/{len(tasks)}")
     print(f"   📁 Sauvés dans: {cleaned_dir}")
     
-    if success_count == len(ninja_files):
+    if success_count == len(tasks):
         print(f"\n🎉 Tous les sprites ont été nettoyés avec succès!")
         print(f"💡 Copiez maintenant les sprites nettoyés:")
-        print(f"   copy {cleaned_dir}\\*.png {assets_dir}")
-        return True
+        print(f"   xcopy /s /y {cleaned_dir} {assets_dir}")
     else:
         print(f"\n⚠️ Quelques sprites n'ont pas pu être nettoyés")
-        return False
+    
+    return batch_counts(len(tasks), len(cached), results)
 
-def analyze_sprite_issues():
+def analyze_sprite_issues(assets_dir='./assets/characters', characters=None):
     """Analyse les problèmes potentiels des sprites"""
     
     print("🔍 ANALYSE DES SPRITES ACTUELS")
     print("=" * 40)
     
-    assets_dir = Path('./assets/characters')
-    ninja_files = list(assets_dir.glob('ninja_*.png'))
+    assets_dir = Path(assets_dir)
+    index, ignored = build_sprite_index(assets_dir)
+    sprite_files = [source for source, _ in frame_tasks(index, assets_dir, characters)]
+    
+    # Seuls les sprites modifiés depuis la dernière analyse sont décodés
+    results, stats = check_sprite_files(sprite_files, assets_dir)
     
     issues_found = []
     
-    for sprite_file in ninja_files:
-        try:
-            with Image.open(sprite_file) as img:
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                
-                data = np.array(img)
-                
-                # Vérifier les pixels blancs
-                white_pixels = np.sum(
-                    (data[:,:,0] > 240) & 
-                    (data[:,:,1] > 240) & 
-                    (data[:,:,2] > 240) &
-                    (data[:,:,3] > 0)  # Non transparents
-                )
-                
-                # Vérifier les bordures
-                border_has_content = (
-                    np.any(data[0,:,3] > 0) or   # Top
-                    np.any(data[-1,:,3] > 0) or  # Bottom
-                    np.any(data[:,0,3] > 0) or   # Left
-                    np.any(data[:,-1,3] > 0)     # Right
-                )
-                
-                issues = []
-                if white_pixels > 0:
-                    issues.append(f"{white_pixels} pixels blancs")
-                if border_has_content:
-                    issues.append("contenu sur les bordures")
-                
-                if issues:
-                    issues_found.append(f"{sprite_file.name}: {', '.join(issues)}")
-                else:
-                    print(f"   ✅ {sprite_file.name}")
-                    
-        except Exception as e:
-            issues_found.append(f"{sprite_file.name}: Erreur - {e}")
+    for sprite_file in sprite_files:
+        issues = results[str(sprite_file)]['issues']
+        if issues:
+            issues_found.append(f"{sprite_file.name}: {', '.join(issues)}")
+        else:
+            print(f"   ✅ {sprite_file.name}")
+    
+    if stats['files']:
+        print(f"   🔎 {stats['decoded']}/{stats['files']} sprites décodés (les autres sont inchangés)")
     
     if issues_found:
         print(f"\n⚠️ PROBLÈMES DÉTECTÉS:")
@@ -365,21 +616,51 @@ def analyze_sprite_issues():
         return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nettoyage avancé des sprites")
+    parser.add_argument('--profile', default='standard',
+                        choices=['auto'] + list(CLEANING_PROFILES),
+                        help="Profil de nettoyage (auto = le moins coûteux sans résidu de fond)")
+    parser.add_argument('--force', action='store_true',
+                        help="Retraiter tous les sprites en ignorant le cache")
+    parser.add_argument('--max-memory', type=float, default=None, metavar='MO',
+                        help="Mémoire de travail max par image (Mo), traitement par bandes")
+    parser.add_argument('--timings', metavar='FICHIER',
+                        help="Enregistrer les temps par étape et par fichier (JSON)")
+    parser.add_argument('--cprofile', metavar='FICHIER',
+                        help="Profiler le nettoyage avec cProfile (statistiques pstats)")
+    parser.add_argument('--root', default='.',
+                        help="Dossier du jeu (contenant assets/characters)")
+    parser.add_argument('--characters', nargs='+', metavar='PERSO',
+                        help="Personnages à traiter (tous par défaut)")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    max_memory = int(args.max_memory * 1024 * 1024) if args.max_memory else None
+    assets_dir = Path(args.root) / 'assets' / 'characters'
+    
+    if args.cprofile and args.jobs != 1:
+        # cProfile ne voit que le processus principal
+        print("ℹ️ --cprofile: traitement sur un seul processus")
+        args.jobs = 1
+    
     print("🎨 OUTIL DE NETTOYAGE AVANCÉ DES SPRITES")
     print("=" * 60)
     
     # D'abord analyser les problèmes
     print("1️⃣ Analyse des sprites actuels...")
-    has_issues = not analyze_sprite_issues()
+    has_issues = not analyze_sprite_issues(assets_dir, args.characters)
     
     if has_issues:
         print("\n2️⃣ Nettoyage des sprites...")
-        success = clean_all_ninja_sprites()
+        clean_args = (args.profile, args.jobs, args.force, max_memory, args.timings, assets_dir, args.characters)
+        if args.cprofile:
+            counts = profile_call(args.cprofile, clean_all_sprites, *clean_args)
+        else:
+            counts = clean_all_sprites(*clean_args)
         
-        if success:
+        if batch_ok(counts):
             print(f"\n🚀 ÉTAPES SUIVANTES:")
             print(f"1. Copier les sprites nettoyés:")
-            print(f"   copy assets\\characters\\cleaned\\*.png assets\\characters\\")
+            print(f"   xcopy /s /y assets\\characters\\cleaned assets\\characters")
             print(f"2. Recharger le jeu pour voir la différence!")
         else:
             print(f"\n❌ Le nettoyage a échoué")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+👯 Détection des frames en double
+Empreinte exacte des pixels décodés (les pixels entièrement transparents
+comptent comme identiques quelle que soit leur couleur) et empreinte
+perceptuelle (dHash 64 bits) pour les quasi-doublons. pack_atlas --dedup
+s'en sert pour ranger une seule fois les frames identiques; ce script
+liste les doublons de toute l'arborescence (copies dans cleaned/,
+optimized/, processed/...) et le volume qu'ils représentent.
+"""
+
+import os
+import hashlib
+import argparse
+from pathlib import Path
+import numpy as np
+from PIL import Image
+
+from image_cache import load_image
+
+# Distance de Hamming maximale entre deux dHash pour un quasi-doublon
+NEAR_DUPLICATE_DISTANCE = 4
+
+def pixel_hash(img):
+    """Empreinte des pixels RGBA (taille comprise)"""
+    
+    data = np.array(img.convert('RGBA'))
+    data[data[:,:,3] == 0] = 0
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{img.width}x{img.height}".encode('ascii'))
+    digest.update(data.tobytes())
+    return digest.hexdigest()
+
+def perceptual_hash(img):
+    """dHash 64 bits de la luminance prémultipliée par l'alpha
+    
+    Chaque bit compare deux pixels voisins d'une réduction 9x8: deux
+    frames presque identiques ne diffèrent que de quelques bits.
+    """
+    
+    data = np.array(img.convert('RGBA'), dtype=np.float32)
+    luminance = (data[:,:,0] * 0.299 + data[:,:,1] * 0.587 + data[:,:,2] * 0.114) * data[:,:,3] / 255
+    small = np.array(Image.fromarray(luminance.astype(np.uint8), 'L').resize((9, 8), Image.Resampling.BOX),
+                     dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+def group_duplicates(frames, near=0):
+    """Associe chaque frame en double à la frame conservée
+    
+    frames: liste de (nom, image). Une frame est un doublon si ses pixels
+    sont identiques à ceux d'une frame précédente, ou (near > 0) si elle a
+    la même taille et un dHash à au plus `near` bits. Retourne
+    {nom du doublon: nom conservé}.
+    """
+    
+    canonical = {}
+    by_hash = {}
+    kept = []  # (nom, taille, dHash) des frames conservées
+    
+    for name, img in frames:
+        exact = pixel_hash(img)
+        if exact in by_hash:
+            canonical[name] = by_hash[exact]
+            continue
+        
+        if near > 0:
+            phash = perceptual_hash(img)
+            match = next((kept_name for kept_name, size, kept_hash in kept
+                          if size == img.size and hamming(phash, kept_hash) <= near), None)
+            if match is not None:
+                canonical[name] = match
+                continue
+            kept.append((name, img.size, phash))
+        
+        by_hash[exact] = name
+    
+    return canonical
+
+def find_duplicates(root='assets/characters', near=NEAR_DUPLICATE_DISTANCE):
+    """Doublons exacts et quasi-doublons parmi tous les PNG de root"""
+    
+    print("👯 RECHERCHE DES FRAMES EN DOUBLE")
+    print("=" * 50)
+    
+    paths = sorted(Path(root).rglob('*.png'))
+    frames = []
+    for path in paths:
+        try:
+            frames.append((str(path), load_image(path)))
+        except Exception as e:
+            print(f"   ⚠️ {path}: {e}")
+    
+    exact = group_duplicates(frames)
+    remaining = [(name, img) for name, img in frames if name not in exact]
+    near_map = group_duplicates(remaining, near) if near > 0 else {}
+    
+    groups = {}
+    for duplicate, kept in exact.items():
+        groups.setdefault(kept, []).append(duplicate)
+    
+    wasted = sum(os.path.getsize(duplicate) for duplicate in exact)
+    print(f"   {len(frames)} images, {len(exact)} doublons exacts ({wasted / 1024:.1f} KB), "
+          f"{len(near_map)} quasi-doublons (≤ {near} bits)")
+    
+    for kept, duplicates in sorted(groups.items()):
+        print(f"\n   🟰 {kept}")
+        for duplicate in sorted(duplicates):
+            print(f"      = {duplicate}")
+    for duplicate, kept in sorted(near_map.items()):
+        print(f"   ≈ {duplicate} ~ {kept}")
+    
+    return exact, near_map
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Détection des frames en double")
+    parser.add_argument('root', nargs='?', default='assets/characters',
+                        help="Dossier à analyser (récursivement)")
+    parser.add_argument('--near', type=int, default=NEAR_DUPLICATE_DISTANCE,
+                        help="Distance dHash maximale des quasi-doublons (0 = exacts seulement)")
+    args = parser.parse_args()
+    
+    find_duplicates(args.root, args.near)
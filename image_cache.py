@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧠 Cache des images décodées partagé par les étapes du pipeline
+Analyse, nettoyage et optimisation relisent les mêmes PNG: chaque fichier
+n'est décodé qu'une fois par processus, dans la limite d'un budget mémoire
+(les images les moins récemment utilisées sont libérées en premier)
+"""
+
+import os
+from collections import OrderedDict
+from PIL import Image
+
+# Budget mémoire du cache (octets de pixels RGBA décodés)
+IMAGE_CACHE_BUDGET = 256 * 1024 * 1024
+
+_images = OrderedDict()
+_stats = {'hits': 0, 'decodes': 0, 'bytes': 0}
+
+def _cache_key(path):
+    """Clé du cache: chemin absolu + date et taille (invalide si le fichier change)"""
+    
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+def _image_bytes(img):
+    return img.width * img.height * 4
+
+def _store(key, img):
+    """Ajoute une image au cache; False si elle dépasse le budget"""
+    
+    size = _image_bytes(img)
+    if size > IMAGE_CACHE_BUDGET:
+        return False
+    
+    # Libérer les images les moins récemment utilisées
+    while _images and _stats['bytes'] + size > IMAGE_CACHE_BUDGET:
+        _, evicted = _images.popitem(last=False)
+        _stats['bytes'] -= _image_bytes(evicted)
+    
+    _images[key] = img
+    _stats['bytes'] += size
+    return True
+
+def load_image(path, mutable=False):
+    """Retourne l'image RGBA décodée d'un fichier, depuis le cache si possible
+    
+    L'image renvoyée est partagée: ne pas la modifier, sauf avec
+    mutable=True qui garantit une image à usage exclusif.
+    """
+    
+    key = _cache_key(path)
+    
+    img = _images.get(key)
+    if img is not None:
+        _images.move_to_end(key)
+        _stats['hits'] += 1
+        return img.copy() if mutable else img
+    
+    with Image.open(path) as source:
+        img = source.convert('RGBA')
+    _stats['decodes'] += 1
+    
+    if not _store(key, img):
+        # Trop grande pour le cache: l'appelant en a l'usage exclusif
+        return img
+    return img.copy() if mutable else img
+
+def remember_image(path, img):
+    """Met en cache une image qui vient d'être écrite dans path
+    
+    Évite de redécoder un fichier que l'on vient soi-même d'encoder;
+    img ne doit plus être modifiée ensuite.
+    """
+    
+    _store(_cache_key(path), img)
+
+def clear_image_cache():
+    """Vide le cache et remet les compteurs à zéro"""
+    
+    _images.clear()
+    _stats.update(hits=0, decodes=0, bytes=0)
+
+def image_cache_stats():
+    """Compteurs du cache (hits, decodes, bytes) et nombre d'images"""
+    
+    return dict(_stats, images=len(_images))
@@ -4,6 +4,9 @@ class AssetManager {
     constructor() {
         this.images = new Map();
         this.sounds = new Map();
+        this.animations = null;
+        this.variant = null;
+        this.frameTrims = new Map();
         this.loaded = 0;
         this.total = 0;
         this.onProgress = null;
@@ -53,6 +56,95 @@ class AssetManager {
         });
     }
     
+    // Charger le schéma des animations, partagé avec les outils Python (sprite_schema.json)
+    async loadAnimationManifest(src = './sprite_schema.json') {
+        try {
+            const response = await fetch(src);
+            if (response.ok) {
+                this.animations = await response.json();
+            }
+        } catch (error) {
+            console.warn(`Schéma des animations indisponible: ${src}`);
+        }
+        return this.animations;
+    }
+    
+    // Configuration d'une animation depuis le schéma (null si absente)
+    getAnimation(character, animation) {
+        const characters = this.animations ? this.animations.characters : null;
+        if (!characters || !characters[character]) {
+            return null;
+        }
+        return characters[character][animation] || null;
+    }
+    
+    // Frames jouables d'une animation: trouvées sur le disque ('available'), sinon attendues
+    static playableFrames(config) {
+        return config.available !== undefined ? config.available : config.frames;
+    }
+    
+    // Choisir l'échelle des sprites (build_variants.py) selon la densité de l'écran:
+    // la plus petite >= devicePixelRatio, sinon la plus grande disponible
+    async loadVariantIndex(src = './assets/variants/index.json', pixelRatio = window.devicePixelRatio || 1) {
+        try {
+            const response = await fetch(src);
+            if (response.ok) {
+                const index = await response.json();
+                this.variant = AssetManager.pickVariant(index.variants, pixelRatio);
+            }
+        } catch (error) {
+            console.warn(`Index des variantes indisponible: ${src}`);
+        }
+        return this.variant;
+    }
+    
+    static pickVariant(variants, pixelRatio) {
+        const sorted = [...variants].sort((a, b) => a.scale - b.scale);
+        return sorted.find(variant => variant.scale >= pixelRatio) || sorted[sorted.length - 1] || null;
+    }
+    
+    // Chemin d'une frame à l'échelle choisie (dossiers assets/characters sinon)
+    getFramePath(character, category, sprite) {
+        const base = this.variant ? `./${this.variant.frames}` : './assets/characters';
+        return `${base}/${character}/${category}/${sprite}.png`;
+    }
+    
+    // Charger toutes les frames d'un personnage depuis son atlas (pack_atlas.py)
+    // Une requête pour la carte JSON et une seule pour la texture
+    // Les frames d'une variante 2x/0.5x se dessinent à leur taille logique (drawImage w, h)
+    async loadAtlas(character, basePath = this.variant ? `./${this.variant.atlases}` : './assets/atlases') {
+        const response = await fetch(`${basePath}/${character}.json`);
+        if (!response.ok) {
+            throw new Error(`Atlas introuvable: ${character}`);
+        }
+        const atlas = await response.json();
+        
+        const sheet = await this.loadImage(`${character}_atlas`, `${basePath}/${atlas.image}`);
+        
+        // Découper chaque frame dans son propre canvas (utilisable par drawImage);
+        // les doublons (pack_atlas.py --dedup) partagent le rectangle et donc le canvas
+        const canvases = new Map();
+        for (const [name, rect] of Object.entries(atlas.frames)) {
+            const key = `${rect.x},${rect.y},${rect.w},${rect.h}`;
+            let canvas = canvases.get(key);
+            if (!canvas) {
+                canvas = document.createElement('canvas');
+                canvas.width = rect.w;
+                canvas.height = rect.h;
+                canvas.getContext('2d').drawImage(sheet, rect.x, rect.y, rect.w, rect.h, 0, 0, rect.w, rect.h);
+                canvases.set(key, canvas);
+            }
+            this.images.set(name, canvas);
+            
+            // Atlas recadré (pack_atlas.py --trim): position du contenu dans la frame d'origine
+            if (rect.sourceW !== undefined) {
+                this.frameTrims.set(name, rect);
+            }
+        }
+        
+        return atlas;
+    }
+    
     // Créer une image placeholder si le fichier n'existe pas
     createPlaceholder(id) {
         const canvas = document.createElement('canvas');
@@ -132,10 +224,23 @@ class AssetManager {
         const characterTypes = ['ninja', 'warrior', 'mage', 'robot'];
         const animations = ['idle', 'walk', 'jump', 'attack', 'hurt'];
         
+        // onComplete une seule fois, quand atlas et images séparées sont tous là
+        const onComplete = this.onComplete;
+        this.onComplete = null;
+        
+        // Échelle adaptée à l'écran (build_variants.py), puis un atlas par personnage
+        await Promise.all([this.loadAnimationManifest(), this.loadVariantIndex()]);
+        const atlases = await Promise.all(characterTypes.map(type =>
+            this.loadAtlas(type).then(() => true, () => false)));
+        
         const loadPromises = [];
         
-        // Charger les sprites des personnages (images séparées)
-        for (const type of characterTypes) {
+        // Images séparées pour les personnages sans atlas
+        for (const [i, type] of characterTypes.entries()) {
+            if (atlases[i]) {
+                continue;
+            }
+            
             for (const anim of animations) {
                 const id = `${type}_${anim}`;
                 const src = `./assets/characters/${type}_${anim}.png`;
@@ -158,6 +263,11 @@ class AssetManager {
         
         await Promise.all(loadPromises);
         console.log('Tous les assets chargés!');
+        
+        this.onComplete = onComplete;
+        if (onComplete) {
+            onComplete();
+        }
     }
     
     // Obtenir une image
@@ -165,6 +275,30 @@ class AssetManager {
         return this.images.get(id);
     }
     
+    // Dessiner une image dans le rectangle (x, y, width, height) de sa frame d'origine;
+    // une frame recadrée ne remplit que la zone de son contenu
+    drawFrame(ctx, id, x, y, width, height) {
+        const image = this.images.get(id);
+        if (!image) {
+            return false;
+        }
+        
+        // Pixel art: une variante plus petite que l'écran est agrandie sans flou
+        ctx.imageSmoothingEnabled = false;
+        
+        const trim = this.frameTrims.get(id);
+        if (!trim) {
+            ctx.drawImage(image, x, y, width, height);
+            return true;
+        }
+        
+        const scaleX = width / trim.sourceW;
+        const scaleY = height / trim.sourceH;
+        ctx.drawImage(image, x + trim.offsetX * scaleX, y + trim.offsetY * scaleY,
+                      trim.w * scaleX, trim.h * scaleY);
+        return true;
+    }
+    
     // Vérifier si une image existe
     hasImage(id) {
         return this.images.has(id);
@@ -224,7 +358,15 @@ class SpriteRenderer {
     }
     
     getFrameCount() {
-        // Nombre de frames par animation (peut être configuré par type)
+        // Nombre de frames depuis sprite_schema.json si disponible
+        const animation = this.assetManager.getAnimation(this.character.type, this.currentAnimation);
+        if (animation) {
+            this.frameRate = animation.frameDuration / 1000;
+            // Au moins une frame: 'available' vaut 0 si les frames ont disparu du disque
+            return Math.max(1, AssetManager.playableFrames(animation));
+        }
+        
+        // Nombre de frames par animation par défaut
         const frameCounts = {
             'idle': 4,
             'walk': 6,
@@ -236,8 +378,15 @@ class SpriteRenderer {
         return frameCounts[this.currentAnimation] || 1;
     }
     
+    // Frame courante de l'atlas (ninja_walk3), sinon image unique de l'animation
+    getSpriteId() {
+        const animationId = `${this.character.type}_${this.currentAnimation}`;
+        const frameId = `${animationId}${this.frameIndex + 1}`;
+        return this.assetManager.hasImage(frameId) ? frameId : animationId;
+    }
+    
     draw(ctx) {
-        const spriteId = `${this.character.type}_${this.currentAnimation}`;
+        const spriteId = this.getSpriteId();
         const image = this.assetManager.getImage(spriteId);
         
         if (!image) {
@@ -265,8 +414,8 @@ class SpriteRenderer {
             ctx.globalAlpha = 0.5;
         }
         
-        // Dessiner l'image du sprite
-        ctx.drawImage(image, x, y, width, height);
+        // Dessiner l'image du sprite (recadrée si elle vient d'un atlas --trim)
+        this.assetManager.drawFrame(ctx, spriteId, x, y, width, height);
         
         // Dessiner les effets spéciaux
         this.drawEffects(ctx);
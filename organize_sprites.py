@@ -7,78 +7,84 @@ import os
 import shutil
 from pathlib import Path
 
+from sprite_index import parse_sprite_name
+from sprite_schema import load_sprite_schema, schema_categories, schema_lookup
+
+def category_table(schema):
+    """Table {(perso, animation): catégorie} du schéma"""
+    
+    return {(character, animation): config['category']
+            for character, animations in schema['characters'].items()
+            for animation, config in animations.items()}
+
+def plan_moves(base_path, schema):
+    """Regroupe les sprites à ranger par dossier de destination
+    
+    Un seul parcours du dossier; le nom est résolu par l'index du schéma,
+    sinon par le motif compilé (frames à plusieurs chiffres comprises).
+    Retourne ({dossier: [fichiers]}, [(fichier, raison)]).
+    """
+    
+    known = schema_lookup()
+    categories = category_table(schema)
+    moves = {}
+    skipped = []
+    
+    with os.scandir(base_path) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.png') or not entry.is_file():
+                continue
+            
+            parsed = known.get(entry.name) or parse_sprite_name(entry.name)
+            if parsed is None:
+                skipped.append((entry.name, "sprite non reconnu"))
+                continue
+            
+            character, animation = parsed[:2]
+            category = categories.get((character, animation))
+            if category is None:
+                skipped.append((entry.name, f"catégorie non trouvée ({character}/{animation})"))
+                continue
+            
+            moves.setdefault(base_path / character / category, []).append(entry.name)
+    
+    return moves, skipped
+
 def organize_sprites():
     base_path = Path("assets/characters")
     
-    # Définition de l'organisation des sprites
-    sprite_organization = {
-        "ninja": {
-            "basic": ["idle", "walk", "jump", "icon"],
-            "combat": ["attack", "hurt"],
-            "special": ["uppercut", "low", "double", "down"]
-        },
-        "mage": {
-            "basic": ["idle", "walk", "jump", "icon"],
-            "combat": ["attack", "hurt"]
-        },
-        "warrior": {
-            "basic": ["idle", "walk", "jump", "icon"],
-            "combat": ["attack", "hurt"]
-        },
-        "robot": {
-            "basic": ["idle", "walk", "jump", "icon"],
-            "combat": ["attack", "hurt"]
-        }
-    }
+    # Organisation des sprites: catégories du schéma partagé (sprite_schema.json)
+    schema = load_sprite_schema()
+    sprite_organization = schema_categories(schema)
     
     print("🗂️  Organisation des sprites par personnage...")
     
-    # Parcourir tous les fichiers dans le dossier characters
-    for file_path in base_path.glob("*.png"):
-        filename = file_path.name
-        
-        # Identifier le personnage
-        character = None
-        for char_name in sprite_organization.keys():
-            if filename.startswith(char_name + "_"):
-                character = char_name
-                break
-        
-        if not character:
-            print(f"⚠️  Sprite non reconnu : {filename}")
-            continue
-            
-        # Identifier la catégorie
-        sprite_type = filename.replace(f"{character}_", "").split("1")[0].split("2")[0].split("3")[0].split(".")[0]
-        
-        category = None
-        for cat_name, sprite_types in sprite_organization[character].items():
-            if sprite_type in sprite_types:
-                category = cat_name
-                break
-        
-        if not category:
-            print(f"⚠️  Catégorie non trouvée pour : {filename} (type: {sprite_type})")
-            continue
-        
-        # Créer le dossier de destination
-        dest_dir = base_path / character / category
+    moves, skipped = plan_moves(base_path, schema)
+    for filename, reason in sorted(skipped):
+        print(f"⚠️  {filename}: {reason}")
+    
+    # Déplacements groupés par dossier: un seul mkdir par destination
+    for dest_dir, filenames in sorted(moves.items()):
         dest_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Déplacer le fichier
-        dest_path = dest_dir / filename
-        try:
-            shutil.move(str(file_path), str(dest_path))
-            print(f"✅ {filename} → {character}/{category}/")
-        except Exception as e:
-            print(f"❌ Erreur pour {filename}: {e}")
+        moved = 0
+        for filename in sorted(filenames):
+            try:
+                os.replace(base_path / filename, dest_dir / filename)
+                moved += 1
+            except OSError:
+                try:
+                    shutil.move(str(base_path / filename), str(dest_dir / filename))
+                    moved += 1
+                except Exception as e:
+                    print(f"❌ Erreur pour {filename}: {e}")
+        print(f"✅ {moved} sprite(s) → {dest_dir.relative_to(base_path)}/")
     
     print("\n📁 Structure finale :")
     for character in sprite_organization.keys():
         char_path = base_path / character
         if char_path.exists():
             print(f"\n{character.upper()}:")
-            for category in ["basic", "combat", "special"]:
+            for category in sorted(sprite_organization[character]):
                 cat_path = char_path / category
                 if cat_path.exists():
                     sprites = list(cat_path.glob("*.png"))
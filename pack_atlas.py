@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 Packer d'atlas de sprites
+Regroupe toutes les frames d'un personnage dans une seule texture PNG
+accompagnée d'une carte JSON nom de frame → rectangle, pour que le jeu
+charge un personnage en une seule requête
+"""
+
+import json
+import math
+import zlib
+import argparse
+from pathlib import Path
+import numpy as np
+from PIL import Image
+
+from sprite_index import build_sprite_index
+from image_cache import load_image, remember_image
+from recompress_sprites import encode_png
+from dedup_sprites import group_duplicates
+
+def collect_character_frames(index, character):
+    """Liste (nom, chemin) des frames d'un personnage, toutes catégories"""
+    
+    frames = []
+    for animation in index.get(character, {}).values():
+        for path in animation['frames'].values():
+            frames.append((Path(path).stem, path))
+    
+    return sorted(frames)
+
+def trim_frame(img):
+    """Recadre une frame sur ses pixels non transparents
+    
+    Retourne (image recadrée, décalage) où décalage = {'offsetX',
+    'offsetY', 'sourceW', 'sourceH'} replace la frame dans sa taille
+    d'origine. Une frame vide devient un pixel transparent.
+    """
+    
+    box = img.getchannel('A').getbbox() or (0, 0, 1, 1)
+    trim = {'offsetX': box[0], 'offsetY': box[1], 'sourceW': img.width, 'sourceH': img.height}
+    return img.crop(box), trim
+
+def trim_frames(frames):
+    """Recadre une liste de (nom, image); retourne (frames, {nom: décalage})"""
+    
+    trimmed, trims = [], {}
+    for name, img in frames:
+        img, trims[name] = trim_frame(img)
+        trimmed.append((name, img))
+    return trimmed, trims
+
+def pack_rects(sizes, padding=1):
+    """Place des rectangles (w, h) par étagères, hauteurs décroissantes
+    
+    La largeur de l'atlas vise un carré de même surface totale.
+    Retourne (positions, largeur, hauteur) où positions[i] = (x, y).
+    """
+    
+    if not sizes:
+        return [], 0, 0
+    
+    area = sum((w + padding) * (h + padding) for w, h in sizes)
+    widest = max(w for w, h in sizes) + padding
+    atlas_width = max(widest, int(math.ceil(math.sqrt(area))))
+    
+    # Placer d'abord les plus hauts pour remplir les étagères
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i))
+    
+    positions = [None] * len(sizes)
+    x = y = 0
+    shelf_height = 0
+    used_width = 0
+    
+    for i in order:
+        w, h = sizes[i]
+        if x > 0 and x + w + padding > atlas_width:
+            # Étagère pleine: passer à la suivante
+            y += shelf_height
+            x = 0
+            shelf_height = 0
+        
+        positions[i] = (x, y)
+        x += w + padding
+        used_width = max(used_width, x)
+        shelf_height = max(shelf_height, h + padding)
+    
+    return positions, used_width - padding, y + shelf_height - padding
+
+def save_atlas_image(atlas, path, optimize=True):
+    """Enregistre la texture
+    
+    optimize=False (mode surveillance): sans filtre PNG et en zlib RLE
+    niveau 1, plusieurs fois plus rapide que le codeur de Pillow.
+    """
+    
+    if optimize:
+        atlas.save(path, 'PNG', optimize=True)
+    else:
+        Path(path).write_bytes(encode_png(np.array(atlas), 'RGBA', 0, 1, zlib.Z_RLE))
+
+def build_atlas(character, frames, output_dir, padding=1, optimize=True, trim=False,
+                dedup=False, near=0):
+    """Construit l'atlas PNG et la carte JSON d'un personnage
+    
+    frames: liste de (nom, image RGBA). Retourne la carte des frames.
+    optimize=False encode vite mais moins compact (mode surveillance).
+    trim=True range les frames recadrées sur leur contenu; chaque
+    rectangle porte alors son décalage (voir trim_frame).
+    dedup=True ne range qu'une fois les frames aux pixels identiques: les
+    doublons pointent sur le même rectangle et sont listés dans
+    'duplicates'. near > 0 y ajoute les quasi-doublons de même taille
+    (distance dHash, voir dedup_sprites): le rendu peut alors changer.
+    """
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    trims = {}
+    if trim:
+        frames, trims = trim_frames(frames)
+    
+    duplicates = group_duplicates(frames, near) if dedup else {}
+    unique = [(name, img) for name, img in frames if name not in duplicates]
+    
+    sizes = [img.size for name, img in unique]
+    positions, width, height = pack_rects(sizes, padding)
+    
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    frame_map = {}
+    
+    for (name, img), (x, y) in zip(unique, positions):
+        atlas.paste(img, (x, y))
+        frame_map[name] = {'x': x, 'y': y, 'w': img.width, 'h': img.height, **trims.get(name, {})}
+    
+    for name, kept in duplicates.items():
+        rect = frame_map[kept]
+        frame_map[name] = {'x': rect['x'], 'y': rect['y'], 'w': rect['w'], 'h': rect['h'], **trims.get(name, {})}
+    frame_map = {name: frame_map[name] for name, img in frames}
+    
+    image_name = f"{character}.png"
+    save_atlas_image(atlas, output_dir / image_name, optimize)
+    
+    atlas_data = {
+        'image': image_name,
+        'size': {'w': width, 'h': height},
+        'trimmed': trim,
+        'frames': frame_map,
+        'duplicates': duplicates,
+    }
+    with open(output_dir / f"{character}.json", 'w', encoding='utf-8') as f:
+        json.dump(atlas_data, f, indent=1)
+    
+    return atlas_data
+
+def pack_character(index, character, output_dir, padding=1, optimize=True, trim=False,
+                   dedup=False, near=0):
+    """Charge les frames d'un personnage et construit son atlas"""
+    
+    frames = []
+    for name, path in collect_character_frames(index, character):
+        frames.append((name, load_image(path)))
+    
+    if not frames:
+        print(f"   ⚠️ {character}: aucune frame trouvée")
+        return None
+    
+    atlas_data = build_atlas(character, frames, output_dir, padding, optimize, trim, dedup, near)
+    
+    # Comparer la surface de l'atlas à celle des frames rangées
+    size = atlas_data['size']
+    frames_area = sum(rect['w'] * rect['h'] for name, rect in atlas_data['frames'].items()
+                      if name not in atlas_data['duplicates'])
+    fill = frames_area / (size['w'] * size['h']) * 100
+    print(f"   ✅ {character}: {len(frames)} frames → {size['w']}x{size['h']} ({fill:.0f}% rempli)")
+    if trim:
+        source_area = sum(img.width * img.height for name, img in frames)
+        print(f"      ✂️ Recadrage: {source_area} → {frames_area} pixels "
+              f"({(1 - frames_area / source_area) * 100:.0f}% en moins)")
+    if atlas_data['duplicates']:
+        print(f"      👯 {len(atlas_data['duplicates'])} doublon(s) rangé(s) une seule fois")
+    
+    return atlas_data
+
+def patch_atlas(character, frames, output_dir, optimize=False):
+    """Remplace des frames dans un atlas existant sans le reconstruire
+    
+    frames: liste de (nom, image RGBA). Chaque frame doit déjà être dans
+    l'atlas avec la même taille (recadrée si l'atlas l'est); sinon rien
+    n'est écrit et None est retourné (il faut reconstruire l'atlas).
+    Retourne la carte des frames.
+    """
+    
+    output_dir = Path(output_dir)
+    map_path = output_dir / f"{character}.json"
+    if not map_path.exists():
+        return None
+    
+    with open(map_path, encoding='utf-8') as f:
+        atlas_data = json.load(f)
+    
+    trims = {}
+    if atlas_data.get('trimmed'):
+        frames, trims = trim_frames(frames)
+    
+    # Un rectangle partagé par des doublons ne peut pas changer pour une seule frame
+    shared = set(atlas_data.get('duplicates', {})) | set(atlas_data.get('duplicates', {}).values())
+    for name, img in frames:
+        rect = atlas_data['frames'].get(name)
+        if rect is None or (rect['w'], rect['h']) != img.size or name in shared:
+            return None
+    
+    image_path = output_dir / atlas_data['image']
+    atlas = load_image(image_path, mutable=True)
+    for name, img in frames:
+        rect = atlas_data['frames'][name]
+        atlas.paste(img, (rect['x'], rect['y']))
+    save_atlas_image(atlas, image_path, optimize)
+    
+    # Même taille recadrée mais contenu déplacé: mettre à jour les décalages
+    moved = [name for name in trims if any(atlas_data['frames'][name][k] != v for k, v in trims[name].items())]
+    for name in moved:
+        atlas_data['frames'][name].update(trims[name])
+    if moved:
+        with open(map_path, 'w', encoding='utf-8') as f:
+            json.dump(atlas_data, f, indent=1)
+    
+    # La prochaine mise à jour repartira de cette image sans la redécoder
+    remember_image(image_path, atlas)
+    
+    return atlas_data
+
+def pack_all_characters(assets_dir='assets/characters', output_dir='assets/atlases', padding=1, trim=False,
+                        dedup=False, near=0):
+    """Construit l'atlas de chaque personnage"""
+    
+    print("🧩 CONSTRUCTION DES ATLAS DE SPRITES")
+    print("=" * 50)
+    
+    index, ignored = build_sprite_index(assets_dir)
+    for path, reason in ignored:
+        print(f"   ⚠️ Sprite ignoré: {path} ({reason})")
+    
+    results = {}
+    for character in sorted(index):
+        atlas_data = pack_character(index, character, output_dir, padding, trim=trim, dedup=dedup, near=near)
+        if atlas_data:
+            results[character] = atlas_data
+    
+    print(f"\n📁 {len(results)} atlas sauvés dans: {output_dir}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Packer d'atlas de sprites")
+    parser.add_argument('--assets', default='assets/characters',
+                        help="Dossier des personnages")
+    parser.add_argument('--output', default='assets/atlases',
+                        help="Dossier de sortie des atlas")
+    parser.add_argument('--padding', type=int, default=1,
+                        help="Marge transparente entre les frames (pixels)")
+    parser.add_argument('--trim', action='store_true',
+                        help="Recadrer les frames sur leur contenu (décalages dans la carte JSON)")
+    parser.add_argument('--dedup', action='store_true',
+                        help="Ranger une seule fois les frames identiques")
+    parser.add_argument('--near', type=int, default=0,
+                        help="Avec --dedup, fusionner aussi les quasi-doublons (distance dHash max)")
+    args = parser.parse_args()
+    
+    pack_all_characters(args.assets, args.output, args.padding, args.trim, args.dedup, args.near)
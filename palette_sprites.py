@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🎨 Palette partagée par personnage
+Rassemble en un seul passage les couleurs de toutes les frames d'un
+personnage; si elles tiennent dans 256 entrées, chaque frame est
+réécrite en PNG indexé 8 bits (PLTE + tRNS) sur cette même palette,
+enregistrée dans assets/palettes/<perso>.json (base des skins par
+échange de palette). Sinon, ou si une frame ne se redécode pas à
+l'identique, on se replie sur une palette propre à la frame, puis sur
+le fichier d'origine. Le JSON indique le mode retenu pour chaque frame;
+il n'est écrit que si au moins une frame utilise la palette commune.
+"""
+
+import json
+import zlib
+import argparse
+from pathlib import Path
+import numpy as np
+
+from sprite_batch import run_batch, add_jobs_argument
+from sprite_index import build_sprite_index
+from recompress_sprites import encode_png, to_palette, decode_rgba
+
+def normalize_transparent(rgba):
+    """Pixels entièrement transparents ramenés à (0, 0, 0, 0)
+    
+    Leur couleur est invisible; l'unifier évite de gaspiller des entrées
+    de palette.
+    """
+    
+    rgba = rgba.copy()
+    rgba[rgba[:,:,3] == 0] = 0
+    return rgba
+
+def shared_palette(frames):
+    """Palette commune à une liste d'arrays RGBA, en un seul passage
+    
+    Retourne (liste des indices par frame, palette RGB, alphas) ou None si
+    les frames réunies ont plus de 256 couleurs.
+    """
+    
+    stacked = np.concatenate([rgba.reshape(-1, 1, 4) for rgba in frames])
+    converted = to_palette(stacked)
+    if converted is None:
+        return None
+    
+    indices, palette, alphas = converted
+    split, start = [], 0
+    for rgba in frames:
+        height, width = rgba.shape[:2]
+        split.append(indices[start:start + height * width].reshape(height, width))
+        start += height * width
+    return split, palette, alphas
+
+def encode_indexed(indices, palette, alphas):
+    """PNG indexé le plus compact (sans filtre ou filtre adaptatif)"""
+    
+    return min((encode_png(indices, 'P', filter_mode, 9, zlib.Z_DEFAULT_STRATEGY, palette, alphas)
+                for filter_mode in (0, 'adaptive')), key=len)
+
+def write_indexed_frame(path, rgba, encodings, write=True, keep_larger=()):
+    """Écrit le premier des encodages fournis qui redonne exactement rgba
+    
+    encodings: liste de (nom, fonction → octets PNG), par préférence. Un
+    encodage plus gros que le fichier actuel est écarté, sauf si son nom
+    est dans keep_larger; le fichier est gardé si aucun ne convient.
+    Retourne (mode retenu, octets avant, octets après).
+    """
+    
+    original = Path(path).read_bytes()
+    for name, encode in encodings:
+        data = encode()
+        if not np.array_equal(normalize_transparent(decode_rgba(data)), rgba):
+            continue
+        if len(data) > len(original) and name not in keep_larger:
+            continue
+        if write and data != original:
+            Path(path).write_bytes(data)
+        return name, len(original), len(data)
+    
+    return 'original', len(original), len(original)
+
+def write_palette(character, palette, alphas, frame_modes, palette_dir):
+    """Enregistre la palette commune et le mode de chaque frame
+    
+    frame_modes: {nom de frame: 'shared' | 'frame' | 'original'}; seules
+    les frames 'shared' sont indexées sur ces couleurs.
+    """
+    
+    alpha_values = alphas.tolist() if alphas is not None else []
+    colors = [list(rgb) + [alpha_values[i] if i < len(alpha_values) else 255]
+              for i, rgb in enumerate(palette.tolist())]
+    Path(palette_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(palette_dir) / f"{character}.json", 'w', encoding='utf-8') as f:
+        json.dump({'character': character, 'colors': colors, 'frames': frame_modes}, f)
+        f.write('\n')
+
+def palettize_character(character, paths, palette_dir, write=True):
+    """Convertit les frames d'un personnage sur sa palette commune"""
+    
+    frames = [normalize_transparent(decode_rgba(Path(path).read_bytes())) for path in paths]
+    shared = shared_palette(frames)
+    
+    if shared is None:
+        print(f"   ⚠️ {character}: plus de 256 couleurs, palette par frame")
+    
+    counts = {}
+    frame_modes = {}
+    before = after = 0
+    for i, (path, rgba) in enumerate(zip(paths, frames)):
+        encodings = []
+        if shared is not None:
+            split, palette, alphas = shared
+            encodings.append(('shared', lambda i=i: encode_indexed(split[i], palette, alphas)))
+        
+        own = to_palette(rgba)
+        if own is not None:
+            encodings.append(('frame', lambda own=own: encode_indexed(*own)))
+        
+        # La palette commune n'est écartée que si elle perd des pixels: un
+        # fichier déjà recompressé peut être plus petit qu'elle
+        mode, size_before, size_after = write_indexed_frame(path, rgba, encodings, write,
+                                                            keep_larger=('shared',))
+        frame_modes[Path(path).stem] = mode
+        counts[mode] = counts.get(mode, 0) + 1
+        before += size_before
+        after += size_after
+    
+    # Palette enregistrée seulement si des frames y sont réellement indexées
+    if write and counts.get('shared'):
+        split, palette, alphas = shared
+        write_palette(character, palette, alphas, frame_modes, palette_dir)
+    elif write:
+        (Path(palette_dir) / f"{character}.json").unlink(missing_ok=True)
+    
+    colors = len(shared[1]) if shared is not None else '>256'
+    detail = ', '.join(f"{count} {mode}" for mode, count in sorted(counts.items()))
+    print(f"   ✅ {character}: {colors} couleurs, {before} → {after} octets ({detail})")
+    
+    return {'character': character, 'shared': counts.get('shared', 0), 'frames': counts,
+            'original_bytes': before, 'final_bytes': after}
+
+def palettize_all(assets_dir='assets/characters', palette_dir='assets/palettes', jobs=1, write=True):
+    """Palette commune et frames indexées pour chaque personnage"""
+    
+    print("🎨 PALETTES PARTAGÉES PAR PERSONNAGE")
+    print("=" * 50)
+    
+    index, ignored = build_sprite_index(assets_dir)
+    tasks = []
+    for character in sorted(index):
+        paths = sorted(path for animation in index[character].values()
+                       for path in animation['frames'].values())
+        tasks.append((character, paths, palette_dir, write))
+    
+    results = run_batch(palettize_character, tasks, jobs)
+    
+    before = sum(r['original_bytes'] for r in results)
+    after = sum(r['final_bytes'] for r in results)
+    print(f"\n📊 {len(results)} personnages: {before} → {after} octets "
+          f"(-{(before - after) / max(1, before) * 100:.1f}%)")
+    
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Palette partagée et PNG indexés par personnage")
+    parser.add_argument('--assets', default='assets/characters',
+                        help="Dossier des personnages")
+    parser.add_argument('--palettes', default='assets/palettes',
+                        help="Dossier des palettes JSON")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Mesurer sans réécrire les fichiers")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
+    palettize_all(args.assets, args.palettes, args.jobs, write=not args.dry_run)
@@ -1,26 +1,32 @@
 import os
+import argparse
+from pathlib import Path
 from PIL import Image, ImageChops
 import numpy as np
 
-def remove_background_auto(image_path, output_path, target_size=(80, 80)):
+from sprite_batch import run_batch, add_jobs_argument, batch_counts, batch_ok
+from sprite_cache import load_manifest, save_manifest, split_cached_tasks, record_tasks
+from sprite_tiles import map_strips, process_strips
+from image_cache import load_image
+from sprite_index import build_sprite_index, frame_tasks
+
+def remove_background_auto(image_path, output_path, target_size=(80, 80), tolerance=30, max_memory=None):
     """
     Retire automatiquement le background et redimensionne l'image
+    (max_memory: budget en octets de la mémoire de travail, traitement par bandes)
     """
     try:
-        # Charger l'image
-        img = Image.open(image_path).convert("RGBA")
+        # Charger l'image (copie modifiable si elle vient du cache partagé)
+        img = load_image(image_path, mutable=True)
         print(f"Traitement de {os.path.basename(image_path)} ({img.width}x{img.height})")
         
-        # Convertir en array numpy pour faciliter le traitement
-        data = np.array(img)
-        
         # Méthode 1: Retirer la couleur dominante des coins
         # Prendre les couleurs des 4 coins
         corners = [
-            tuple(data[0, 0, :3]),      # Top-left
-            tuple(data[0, -1, :3]),     # Top-right  
-            tuple(data[-1, 0, :3]),     # Bottom-left
-            tuple(data[-1, -1, :3])     # Bottom-right
+            img.getpixel((0, 0))[:3],                          # Top-left
+            img.getpixel((img.width - 1, 0))[:3],              # Top-right
+            img.getpixel((0, img.height - 1))[:3],             # Bottom-left
+            img.getpixel((img.width - 1, img.height - 1))[:3]  # Bottom-right
         ]
         
         # Trouver la couleur de fond la plus fréquente dans les coins
@@ -31,22 +37,29 @@ def remove_background_auto(image_path, output_path, target_size=(80, 80)):
         bg_color = max(corner_colors.items(), key=lambda x: x[1])[0]
         print(f"  Couleur de fond détectée: RGB{bg_color}")
         
-        # Créer un masque pour la couleur de fond (avec tolérance)
-        tolerance = 30
-        mask = np.all(np.abs(data[:, :, :3] - bg_color) <= tolerance, axis=2)
+        # Différence calculée en uint8, comme sur l'array de l'image
+        bg_array = np.array(bg_color, dtype=np.uint8)
+        
+        def background_mask(strip):
+            # Masque de la couleur de fond (avec tolérance)
+            return np.all(np.abs(strip[:, :, :3] - bg_array) <= tolerance, axis=2)
         
-        # Appliquer la transparence
-        data[mask, 3] = 0  # Rendre transparent
+        def count_opaque(strip, top):
+            return int(np.sum((strip[:, :, 3] > 0) & ~background_mask(strip)))
         
-        # Reconvertir en image PIL
-        result = Image.fromarray(data, 'RGBA')
+        def apply_mask(strip, above):
+            strip[background_mask(strip), 3] = 0  # Rendre transparent
+            return strip
         
-        # Si ça n'a pas bien marché, essayer une autre méthode
-        if np.sum(data[:, :, 3] > 0) < (img.width * img.height * 0.1):  # Moins de 10% opaque
+        # Si ça ne marche pas bien, essayer une autre méthode
+        opaque_pixels = sum(map_strips(img, count_opaque, max_memory))
+        if opaque_pixels < (img.width * img.height * 0.1):  # Moins de 10% opaque
             print(f"  Méthode couleur échouée, essai méthode contours...")
             # Méthode alternative: garder seulement la zone centrale
-            img = Image.open(image_path).convert("RGBA")
             result = remove_background_center_crop(img)
+        else:
+            # Appliquer la transparence bande par bande, sans copie de l'image
+            result = process_strips(img, apply_mask, max_memory)
         
         # Redimensionner à la taille cible
         result = result.resize(target_size, Image.Resampling.LANCZOS)
@@ -80,48 +93,76 @@ def remove_background_center_crop(img, margin_percent=0.15):
     
     return result
 
-def process_ninja_sprites():
+def process_character_sprites(jobs=1, force=False, target_size=(80, 80), tolerance=30, max_memory=None,
+                              input_dir="assets/characters", characters=None):
     """
-    Traite tous les sprites ninja avec animations multiples
+    Traite les frames numérotées de tous les personnages
+    (<perso>/<catégorie>/, écrites au même emplacement sous processed/;
+    jobs: nombre de processus en parallèle, force: ignorer le cache,
+    characters: personnages à traiter, tous si None). Retourne le bilan
+    du lot (voir sprite_batch.batch_counts)
     """
-    input_dir = "assets/characters"
-    output_dir = "assets/characters/processed"
+    output_dir = os.path.join(input_dir, "processed")
     
     # Créer le dossier de sortie
     os.makedirs(output_dir, exist_ok=True)
     
-    # Lister tous les fichiers ninja avec numéros
-    ninja_files = []
-    for file in os.listdir(input_dir):
-        if file.startswith('ninja_') and file.endswith('.png'):
-            if any(char.isdigit() for char in file):  # Contient un chiffre
-                ninja_files.append(file)
+    # Frames numérotées de tous les personnages, en un seul parcours
+    index, ignored = build_sprite_index(input_dir)
+    sprite_files = [
+        (source, output) for source, output in frame_tasks(index, output_dir, characters)
+        if any(char.isdigit() for char in source.name)  # Contient un chiffre
+    ]
     
-    ninja_files.sort()  # Trier pour avoir un ordre correct
-    
-    print(f"🥷 Traitement de {len(ninja_files)} sprites ninja...")
+    print(f"🎮 Traitement de {len(sprite_files)} sprites...")
     print("=" * 50)
     
-    success_count = 0
-    for file in ninja_files:
-        input_path = os.path.join(input_dir, file)
-        output_path = os.path.join(output_dir, file)
-        
-        if remove_background_auto(input_path, output_path):
-            success_count += 1
+    tasks = [
+        (source, output, target_size, tolerance, max_memory)
+        for source, output in sprite_files
+    ]
+    
+    # Ne retraiter que les sprites modifiés depuis le dernier passage
+    params = {'target_size': target_size, 'tolerance': tolerance}
+    manifest = load_manifest(output_dir)
+    todo, cached, hashes = split_cached_tasks(manifest, tasks, params, force, base=output_dir)
+    if cached:
+        print(f"⏭️ {len(cached)} sprites déjà à jour (cache)")
+    
+    for parent in sorted({Path(task[1]).parent for task in todo}):
+        parent.mkdir(parents=True, exist_ok=True)
+    
+    results = run_batch(remove_background_auto, todo, jobs)
+    record_tasks(manifest, todo, hashes, results, params, base=output_dir)
+    save_manifest(manifest, output_dir)
+    
+    success_count = len(cached) + sum(results)
     
     print("=" * 50)
-    print(f"✅ Traitement terminé: {success_count}/{len(ninja_files)} sprites traités avec succès")
+    print(f"✅ Traitement terminé: {success_count}/{len(tasks)} sprites traités avec succès")
     
-    return success_count > 0
+    return batch_counts(len(tasks), len(cached), results)
 
 if __name__ == "__main__":
-    # Changer vers le répertoire du jeu
-    os.chdir(r"C:\Users\Kraken\Documents\Play")
+    parser = argparse.ArgumentParser(description="Suppression du fond des sprites des personnages")
+    parser.add_argument('--force', action='store_true',
+                        help="Retraiter tous les sprites en ignorant le cache")
+    parser.add_argument('--max-memory', type=float, default=None, metavar='MO',
+                        help="Mémoire de travail max par image (Mo), traitement par bandes")
+    parser.add_argument('--root', default='.',
+                        help="Dossier du jeu (contenant assets/characters)")
+    parser.add_argument('--characters', nargs='+', metavar='PERSO',
+                        help="Personnages à traiter (tous par défaut)")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    max_memory = int(args.max_memory * 1024 * 1024) if args.max_memory else None
     
     # Traiter les sprites
-    if process_ninja_sprites():
+    input_dir = os.path.join(args.root, "assets", "characters")
+    counts = process_character_sprites(args.jobs, args.force, max_memory=max_memory, input_dir=input_dir,
+                                       characters=args.characters)
+    if batch_ok(counts):
         print("\n🎉 Tous les sprites sont prêts !")
-        print("📁 Fichiers sauvegardés dans: assets/characters/processed/")
+        print(f"📁 Fichiers sauvegardés dans: {os.path.join(input_dir, 'processed')}")
     else:
         print("\n❌ Erreur lors du traitement")
\ No newline at end of file
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗜️ Recompression PNG sans perte des sprites
+Essaie plusieurs stratégies d'encodage par fichier (niveaux zlib, filtres
+PNG, conversion en palette quand les couleurs tiennent) et garde la plus
+petite, en mesurant les octets gagnés et le temps d'encodage
+"""
+
+import io
+import time
+import zlib
+import struct
+import argparse
+from pathlib import Path
+import numpy as np
+from PIL import Image
+
+from sprite_batch import run_batch, add_jobs_argument
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Types de couleur PNG: (code, octets par pixel)
+COLOR_TYPES = {
+    'RGBA': (6, 4),
+    'RGB': (2, 3),
+    'P': (3, 1),
+}
+
+FILTER_MODES = [0, 1, 2, 3, 4, 'adaptive']
+ZLIB_STRATEGIES = {
+    'default': zlib.Z_DEFAULT_STRATEGY,
+    'filtered': zlib.Z_FILTERED,
+}
+
+def png_chunk(tag, data):
+    """Encode un chunk PNG (longueur, type, données, CRC)"""
+    
+    crc = zlib.crc32(tag + data) & 0xffffffff
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', crc)
+
+def filter_scanlines(raw, bpp):
+    """Applique les 5 filtres PNG à toutes les lignes en une fois
+    
+    raw: array (hauteur, largeur * bpp) uint8. Retourne un array
+    (5, hauteur, largeur * bpp) uint8, un plan par type de filtre.
+    """
+    
+    raw = raw.astype(np.int16)
+    left = np.zeros_like(raw)
+    left[:, bpp:] = raw[:, :-bpp]
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+    up_left = np.zeros_like(raw)
+    up_left[1:, bpp:] = raw[:-1, :-bpp]
+    
+    # Prédicteur de Paeth
+    p = left + up - up_left
+    pa = np.abs(p - left)
+    pb = np.abs(p - up)
+    pc = np.abs(p - up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+    
+    filtered = np.stack([
+        raw,
+        raw - left,
+        raw - up,
+        raw - (left + up) // 2,
+        raw - paeth,
+    ])
+    return (filtered & 0xff).astype(np.uint8)
+
+def filtered_stream(raw, bpp, filter_mode):
+    """Octets à compresser: type de filtre + ligne filtrée, ligne par ligne"""
+    
+    if filter_mode == 0:
+        # Sans filtre: inutile de calculer les autres plans
+        stream = np.zeros((raw.shape[0], raw.shape[1] + 1), dtype=np.uint8)
+        stream[:, 1:] = raw
+        return stream.tobytes()
+    
+    planes = filter_scanlines(raw, bpp)
+    
+    if filter_mode == 'adaptive':
+        # Heuristique classique: somme minimale des valeurs vues comme signées
+        costs = np.abs(planes.view(np.int8).astype(np.int32)).sum(axis=2)
+        choice = np.argmin(costs, axis=0)
+    else:
+        choice = np.full(raw.shape[0], filter_mode)
+    
+    rows = planes[choice, np.arange(raw.shape[0])]
+    return np.hstack([choice.astype(np.uint8)[:, None], rows]).tobytes()
+
+def encode_png(pixels, mode, filter_mode, level=9, strategy=zlib.Z_DEFAULT_STRATEGY,
+               palette=None, transparency=None):
+    """Encode un array de pixels en PNG 8 bits avec un filtre et un zlib donnés"""
+    
+    height, width = pixels.shape[:2]
+    color_type, bpp = COLOR_TYPES[mode]
+    raw = pixels.reshape(height, width * bpp)
+    
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+    data = compressor.compress(filtered_stream(raw, bpp, filter_mode)) + compressor.flush()
+    
+    png = PNG_SIGNATURE
+    png += png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+    if palette is not None:
+        png += png_chunk(b'PLTE', palette.tobytes())
+    if transparency is not None:
+        png += png_chunk(b'tRNS', transparency.tobytes())
+    png += png_chunk(b'IDAT', data)
+    png += png_chunk(b'IEND', b'')
+    return png
+
+def to_palette(rgba):
+    """Convertit sans perte en palette si l'image a au plus 256 couleurs RGBA
+    
+    Retourne (indices, palette RGB, alphas) ou None si trop de couleurs.
+    """
+    
+    packed = rgba.reshape(-1, 4).copy().view(np.uint32).ravel()
+    colors, indices = np.unique(packed, return_inverse=True)
+    if len(colors) > 256:
+        return None
+    
+    entries = colors.view(np.uint8).reshape(-1, 4)
+    
+    # Couleurs opaques à la fin pour raccourcir le chunk tRNS
+    order = np.argsort(entries[:, 3] == 255, kind='stable')
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    entries = entries[order]
+    indices = remap[indices].astype(np.uint8).reshape(rgba.shape[:2])
+    
+    opaque = entries[:, 3] == 255
+    trns_len = len(entries) - int(opaque.sum())
+    alphas = entries[:trns_len, 3] if trns_len else None
+    
+    return indices, entries[:, :3], alphas
+
+def pillow_encode(img, **options):
+    """Encode avec le codeur PNG de Pillow"""
+    
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG', **options)
+    return buffer.getvalue()
+
+def candidate_encodings(rgba):
+    """Génère (nom, fonction d'encodage) pour chaque stratégie applicable"""
+    
+    img = Image.fromarray(rgba, 'RGBA')
+    yield 'pillow-optimize', lambda: pillow_encode(img, optimize=True)
+    
+    # Sans canal alpha utile, RGB suffit
+    if np.all(rgba[:, :, 3] == 255):
+        pixels, mode = np.ascontiguousarray(rgba[:, :, :3]), 'RGB'
+    else:
+        pixels, mode = rgba, 'RGBA'
+    
+    for filter_mode in FILTER_MODES:
+        for strategy_name, strategy in ZLIB_STRATEGIES.items():
+            name = f"zlib9-{mode.lower()}-f{filter_mode}-{strategy_name}"
+            yield name, (lambda f=filter_mode, s=strategy: encode_png(pixels, mode, f, 9, s))
+    
+    converted = to_palette(rgba)
+    if converted is not None:
+        indices, palette, alphas = converted
+        
+        palette_img = Image.fromarray(indices, 'P')
+        palette_img.putpalette(palette.ravel().tolist())
+        options = {'optimize': True}
+        if alphas is not None:
+            options['transparency'] = alphas.tobytes()
+        yield 'palette-pillow', lambda: pillow_encode(palette_img, **options)
+        
+        for filter_mode in (0, 'adaptive'):
+            yield f"palette-f{filter_mode}", (
+                lambda f=filter_mode: encode_png(indices, 'P', f, 9, zlib.Z_DEFAULT_STRATEGY,
+                                                 palette, alphas)
+            )
+
+def decode_rgba(png_bytes):
+    """Décode des octets PNG en array RGBA"""
+    
+    with Image.open(io.BytesIO(png_bytes)) as img:
+        return np.array(img.convert('RGBA'))
+
+def recompress_sprite(input_path, output_path=None, write=True):
+    """Réencode un sprite avec la stratégie sans perte la plus compacte
+    
+    Retourne un dictionnaire de statistiques (tailles, stratégie, temps).
+    """
+    
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path else input_path
+    
+    original = input_path.read_bytes()
+    rgba = decode_rgba(original)
+    
+    best_name, best_data = 'original', original
+    start = time.perf_counter()
+    
+    for name, encode in candidate_encodings(rgba):
+        data = encode()
+        if len(data) < len(best_data) and np.array_equal(decode_rgba(data), rgba):
+            best_name, best_data = name, data
+    
+    encode_time = time.perf_counter() - start
+    
+    if write and (best_data is not original or output_path != input_path):
+        output_path.write_bytes(best_data)
+    
+    saved = len(original) - len(best_data)
+    print(f"   {'✅' if saved else '➖'} {input_path.name}: {len(original)} → {len(best_data)} octets "
+          f"(-{saved}, {best_name}, {encode_time * 1000:.0f} ms)")
+    
+    return {
+        'file': str(input_path),
+        'original_bytes': len(original),
+        'final_bytes': len(best_data),
+        'strategy': best_name,
+        'encode_time': encode_time,
+    }
+
+def recompress_all(paths, jobs=1, write=True):
+    """Recompresse une liste de sprites et affiche le bilan"""
+    
+    print("🗜️ RECOMPRESSION PNG SANS PERTE")
+    print("=" * 50)
+    
+    paths = sorted(Path(p) for p in paths)
+    results = run_batch(recompress_sprite, [(p, None, write) for p in paths], jobs)
+    
+    original = sum(r['original_bytes'] for r in results)
+    final = sum(r['final_bytes'] for r in results)
+    encode_time = sum(r['encode_time'] for r in results)
+    
+    print(f"\n📊 {len(results)} sprites: {original} → {final} octets "
+          f"(-{original - final}, {(original - final) / max(1, original) * 100:.1f}%)")
+    print(f"   ⏱️ Temps d'encodage total: {encode_time:.2f} s")
+    
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompression PNG sans perte des sprites")
+    parser.add_argument('paths', nargs='*', default=['assets/characters'],
+                        help="Fichiers PNG ou dossiers (parcourus récursivement)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Mesurer sans réécrire les fichiers")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
+    files = []
+    for path in map(Path, args.paths):
+        files.extend(path.rglob('*.png') if path.is_dir() else [path])
+    
+    recompress_all(files, args.jobs, write=not args.dry_run)
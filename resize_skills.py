@@ -1,47 +1,131 @@
 from PIL import Image
+import argparse
 import os
+from pathlib import Path
 
-def resize_skills_sprites():
-    """Redimensionne tous les sprites du dossier skills à 80x80"""
+from sprite_batch import run_batch, add_jobs_argument
+from sprite_cache import load_manifest, save_manifest, split_cached_tasks, record_tasks
+
+# Tailles produites à partir de chaque sprite source de skills/ (80 = jeu,
+# 160 = écrans HiDPI, 40 = vignettes). Les sources restent intactes; les
+# sorties vont dans skills/<taille>/. Une taille plus grande que la source
+# n'est pas produite: l'agrandir n'ajouterait que du flou
+SKILL_SIZES = (80, 160, 40)
+
+def skill_output_path(skills_path, size, filename):
+    return Path(skills_path) / str(size) / filename
+
+def fit_square(img, size):
+    """Sprite ramené dans un carré size x size sans déformation
+    
+    Le côté le plus long prend toute la taille; l'autre est centré sur un
+    fond transparent (comme optimize_sprite_quality).
+    """
+    
+    if img.size == (size, size):
+        return img
+    
+    ratio = size / max(img.size)
+    new_size = (max(1, round(img.width * ratio)), max(1, round(img.height * ratio)))
+    # LANCZOS pour la qualité
+    resized = img.resize(new_size, Image.Resampling.LANCZOS)
+    
+    final_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    final_img.paste(resized, ((size - new_size[0]) // 2, (size - new_size[1]) // 2))
+    return final_img
+
+def resize_skill(source, outputs):
+    """Décode la source une fois et écrit chaque taille demandée
+    
+    outputs: [(taille, chemin)]. Chaque taille est rééchantillonnée depuis
+    la source, jamais depuis une sortie déjà redimensionnée.
+    """
+    
+    filename = Path(source).name
+    try:
+        with Image.open(source) as img:
+            img = img.convert('RGBA')
+        original_size = img.size
+        
+        for size, output in outputs:
+            fit_square(img, size).save(output, 'PNG', optimize=True)
+        
+        sizes = ', '.join(f"{size}x{size}" for size, _ in outputs)
+        print(f"✅ {filename}: {original_size} → {sizes}")
+        return True
     
-    skills_path = "assets/characters/skills/"
+    except Exception as e:
+        print(f"❌ Erreur avec {filename}: {e}")
+        return False
+
+def resize_skills_sprites(skills_path="assets/characters/skills/", sizes=SKILL_SIZES, jobs=1, force=False):
+    """Produit les sprites du dossier skills aux tailles demandées
+    
+    Les sorties déjà à jour (même source, mêmes tailles) ne sont pas
+    refaites. Retourne le nombre de sprites sources traités.
+    """
     
     if not os.path.exists(skills_path):
         print(f"❌ Dossier {skills_path} non trouvé")
-        return
+        return 0
     
     print("🎯 Redimensionnement des sprites spéciaux...")
     
-    # Liste tous les fichiers PNG dans skills/
-    sprite_files = [f for f in os.listdir(skills_path) if f.endswith('.png')]
+    # Sources: les PNG directement dans skills/ (les tailles sont dans des sous-dossiers)
+    sprite_files = sorted(f for f in os.listdir(skills_path) if f.endswith('.png'))
     
     if not sprite_files:
         print("❌ Aucun sprite PNG trouvé dans skills/")
-        return
+        return 0
     
     print(f"📁 {len(sprite_files)} sprites trouvés:")
     
+    # Une entrée par source: empreinte et tailles de la dernière production.
+    # Les tailles au-delà de la source sont écartées (et leur ancienne sortie supprimée)
+    tasks = []
     for filename in sprite_files:
-        filepath = os.path.join(skills_path, filename)
+        source = os.path.join(skills_path, filename)
+        with Image.open(source) as img:
+            source_size = max(img.size)
+        
+        outputs = []
+        for size in sizes:
+            output = skill_output_path(skills_path, size, filename)
+            if size <= source_size:
+                output.parent.mkdir(exist_ok=True)
+                outputs.append((size, output))
+                continue
+            print(f"⏭️ {filename}: {size}x{size} écarté (source de {source_size} px)")
+            output.unlink(missing_ok=True)
         
-        try:
-            # Ouvrir l'image
-            img = Image.open(filepath)
-            original_size = img.size
-            
-            # Redimensionner à 80x80 avec LANCZOS pour la qualité
-            resized_img = img.resize((80, 80), Image.Resampling.LANCZOS)
-            
-            # Sauvegarder (écrase l'original)
-            resized_img.save(filepath, 'PNG', optimize=True)
-            
-            print(f"✅ {filename}: {original_size} → (80, 80)")
-            
-        except Exception as e:
-            print(f"❌ Erreur avec {filename}: {e}")
+        if outputs:
+            tasks.append((source, outputs))
+    
+    params = {'sizes': sorted(sizes), 'resample': 'lanczos', 'fit': 'pad'}
+    manifest = load_manifest(skills_path)
+    todo, cached, hashes = split_cached_tasks(manifest, tasks, params, force)
+    if cached:
+        print(f"⏭️ {len(cached)} sprites déjà à jour")
+    
+    results = run_batch(resize_skill, todo, jobs)
+    record_tasks(manifest, todo, hashes, results, params)
+    save_manifest(manifest, skills_path)
+    
+    resized_count = sum(1 for ok in results if ok)
+    produced = sorted({size for _, outputs in tasks for size, _ in outputs}, reverse=True)
     
     print("\n🎉 Redimensionnement terminé !")
-    print("🎯 Tous les sprites spéciaux sont maintenant en 80x80")
+    print(f"🎯 {resized_count} sprites spéciaux produits en {', '.join(f'{s}x{s}' for s in produced)}")
+    
+    return resized_count
 
 if __name__ == "__main__":
-    resize_skills_sprites()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Redimensionnement des sprites spéciaux (skills/)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SKILL_SIZES),
+                        help="Tailles à produire (pixels, carré)")
+    parser.add_argument('--force', action='store_true',
+                        help="Tout refaire en ignorant le cache")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
+    resize_skills_sprites(sizes=args.sizes, jobs=args.jobs, force=args.force)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔪 Découpage d'une planche de sprites en frames numérotées
+Une planche (grille régulière ou frames détectées automatiquement par
+composantes connexes de l'alpha) est décodée une seule fois, puis chaque
+frame est écrite directement dans assets/characters/<perso>/<catégorie>/
+sous le nom <perso>_<animation><n>.png attendu par les autres scripts
+"""
+
+import argparse
+from pathlib import Path
+import numpy as np
+from PIL import Image
+
+from sprite_index import build_sprite_index, parse_sprite_name
+from image_cache import load_image
+
+def parse_size(text):
+    """'8x5' → (8, 5)"""
+    
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height or width)
+
+def grid_boxes(width, height, columns=None, rows=None, frame_size=None):
+    """Cases d'une grille régulière (gauche, haut, droite, bas), ligne par ligne"""
+    
+    if frame_size:
+        cell_w, cell_h = frame_size
+    else:
+        cell_w, cell_h = width // columns, height // rows
+    
+    return [(x, y, x + cell_w, y + cell_h)
+            for y in range(0, height - cell_h + 1, cell_h)
+            for x in range(0, width - cell_w + 1, cell_w)]
+
+def alpha_runs(mask):
+    """Segments horizontaux opaques du masque: (ligne, début, fin exclue)"""
+    
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    
+    # argwhere parcourt ligne par ligne: débuts et fins restent appariés
+    starts = np.argwhere(edges == 1)
+    ends = np.argwhere(edges == -1)
+    return starts[:, 0], starts[:, 1], ends[:, 1]
+
+def label_runs(rows, starts, ends, width):
+    """Étiquette les segments par composante connexe (8-connexité)
+    
+    Deux segments de lignes consécutives sont reliés s'ils se touchent, même
+    en diagonale. Les paires sont trouvées par recherche dichotomique et les
+    étiquettes propagées par minimum, le tout sans boucle par pixel.
+    """
+    
+    count = len(rows)
+    if not count:
+        return np.zeros(0, dtype=np.int64)
+    
+    # Clés globales triées (ligne, colonne) pour chercher dans la ligne suivante
+    stride = width + 2
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends - 1
+    
+    next_row = (rows + 1) * stride
+    lo = np.searchsorted(end_keys, next_row + starts - 1, 'left')
+    hi = np.searchsorted(start_keys, next_row + ends, 'right')
+    links = np.maximum(hi - lo, 0)
+    
+    a = np.repeat(np.arange(count), links)
+    b = np.repeat(lo, links) + (np.arange(links.sum()) - np.repeat(np.cumsum(links) - links, links))
+    
+    labels = np.arange(count)
+    while True:
+        smallest = np.minimum(labels[a], labels[b])
+        updated = labels.copy()
+        np.minimum.at(updated, a, smallest)
+        np.minimum.at(updated, b, smallest)
+        # Saut de pointeurs: chaque segment prend l'étiquette de son étiquette
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+def component_boxes(alpha, min_alpha=1, min_pixels=16):
+    """Boîtes englobantes (gauche, haut, droite, bas) des composantes opaques"""
+    
+    rows, starts, ends = alpha_runs(alpha >= min_alpha)
+    labels = label_runs(rows, starts, ends, alpha.shape[1])
+    if not len(labels):
+        return []
+    
+    components, inverse = np.unique(labels, return_inverse=True)
+    n = len(components)
+    
+    left = np.full(n, alpha.shape[1])
+    top = np.full(n, alpha.shape[0])
+    right = np.zeros(n, dtype=np.int64)
+    bottom = np.zeros(n, dtype=np.int64)
+    pixels = np.zeros(n, dtype=np.int64)
+    
+    np.minimum.at(left, inverse, starts)
+    np.minimum.at(top, inverse, rows)
+    np.maximum.at(right, inverse, ends)
+    np.maximum.at(bottom, inverse, rows + 1)
+    np.add.at(pixels, inverse, ends - starts)
+    
+    # Les poussières isolées ne sont pas des frames
+    keep = pixels >= min_pixels
+    return [tuple(int(v) for v in box)
+            for box in zip(left[keep], top[keep], right[keep], bottom[keep])]
+
+def merge_close_boxes(boxes, gap=2):
+    """Fusionne les boîtes séparées de moins de `gap` pixels
+    
+    Regroupe les morceaux détachés d'une même frame (arme, effet, ombre).
+    """
+    
+    boxes = list(boxes)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                a, b = boxes[i], boxes[j]
+                if (a[0] - gap < b[2] and b[0] - gap < a[2] and
+                        a[1] - gap < b[3] and b[1] - gap < a[3]):
+                    boxes[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return boxes
+
+def reading_order(boxes):
+    """Trie les boîtes ligne par ligne puis de gauche à droite"""
+    
+    ordered = []
+    row = []
+    row_bottom = 0
+    
+    for box in sorted(boxes, key=lambda box: (box[1], box[0])):
+        # Une boîte dont le centre est sous la ligne courante en commence une autre
+        if row and (box[1] + box[3]) / 2 >= row_bottom:
+            ordered.extend(sorted(row))
+            row = []
+        row.append(box)
+        row_bottom = max(b[3] for b in row)
+    
+    ordered.extend(sorted(row))
+    return ordered
+
+def detect_frame_boxes(img, min_alpha=1, min_pixels=16, gap=2):
+    """Détecte automatiquement les frames d'une planche sur fond transparent"""
+    
+    alpha = np.array(img.getchannel('A'))
+    boxes = component_boxes(alpha, min_alpha, min_pixels)
+    return reading_order(merge_close_boxes(boxes, gap))
+
+def extract_frames(img, boxes, uniform=True):
+    """Découpe les frames; avec uniform, toutes sur un canevas commun
+    
+    Le canevas a la taille de la plus grande frame, chaque frame y est
+    centrée horizontalement et posée en bas (les pieds restent alignés).
+    """
+    
+    frames = [img.crop(box) for box in boxes]
+    if not uniform or not frames:
+        return frames
+    
+    width = max(frame.width for frame in frames)
+    height = max(frame.height for frame in frames)
+    
+    canvases = []
+    for frame in frames:
+        canvas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        canvas.paste(frame, ((width - frame.width) // 2, height - frame.height))
+        canvases.append(canvas)
+    return canvases
+
+def slice_sheet(sheet_path, character, animation, category=None, assets_dir='assets/characters',
+                grid=None, frame_size=None, start=1, min_pixels=16, gap=2, write=True):
+    """Découpe une planche et écrit les frames numérotées d'une animation
+    
+    grid=(colonnes, lignes) ou frame_size=(largeur, hauteur) pour une grille
+    régulière (cases vides ignorées); sinon détection automatique.
+    Retourne la liste des chemins écrits.
+    """
+    
+    if parse_sprite_name(f"{character}_{animation}1.png") is None:
+        raise ValueError(f"Nom invalide: {character}_{animation} (minuscules et _ uniquement)")
+    
+    # Catégorie: celle de l'animation si elle existe déjà
+    index, _ = build_sprite_index(assets_dir) if Path(assets_dir).is_dir() else ({}, [])
+    existing = index.get(character, {}).get(animation)
+    if category is None:
+        if existing is None:
+            raise ValueError(f"Catégorie inconnue pour {character}_{animation}: préciser --category")
+        category = existing['category']
+    
+    img = load_image(sheet_path)
+    print(f"🔪 Découpage de {Path(sheet_path).name} ({img.width}x{img.height})")
+    
+    if grid or frame_size:
+        columns, rows = grid or (None, None)
+        boxes = grid_boxes(img.width, img.height, columns, rows, frame_size)
+        # Ignorer les cases vides en fin de planche
+        alpha = np.array(img.getchannel('A'))
+        boxes = [box for box in boxes if alpha[box[1]:box[3], box[0]:box[2]].any()]
+        frames = extract_frames(img, boxes, uniform=False)
+    else:
+        boxes = detect_frame_boxes(img, min_pixels=min_pixels, gap=gap)
+        frames = extract_frames(img, boxes)
+    
+    if not frames:
+        print("   ⚠️ Aucune frame trouvée")
+        return []
+    
+    dest_dir = Path(assets_dir) / character / category
+    if write:
+        dest_dir.mkdir(parents=True, exist_ok=True)
+    
+    written = []
+    for number, frame in enumerate(frames, start):
+        path = dest_dir / f"{character}_{animation}{number}.png"
+        if write:
+            frame.save(path, 'PNG', optimize=True)
+        written.append(path)
+    
+    print(f"   ✅ {len(frames)} frames {frames[0].width}x{frames[0].height} → {dest_dir}/"
+          f"{character}_{animation}{start}..{start + len(frames) - 1}.png")
+    
+    # Frames d'un découpage précédent plus long
+    if existing:
+        stale = sorted(n for n in existing['frames'] if n >= start + len(frames))
+        if stale:
+            print(f"   ⚠️ Frames existantes au-delà: {stale} (à supprimer si obsolètes)")
+    
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Découpage d'une planche de sprites en frames")
+    parser.add_argument('sheet', help="Planche PNG (fond transparent)")
+    parser.add_argument('character', help="Personnage (ex: ninja)")
+    parser.add_argument('animation', help="Animation (ex: walk)")
+    parser.add_argument('--category', help="Catégorie (par défaut celle de l'animation existante)")
+    parser.add_argument('--assets', default='assets/characters',
+                        help="Dossier des personnages")
+    parser.add_argument('--grid', type=parse_size,
+                        help="Grille régulière COLONNESxLIGNES (ex: 8x5)")
+    parser.add_argument('--frame-size', type=parse_size,
+                        help="Grille régulière de cases LARGEURxHAUTEUR (ex: 80x80)")
+    parser.add_argument('--start', type=int, default=1,
+                        help="Numéro de la première frame")
+    parser.add_argument('--min-pixels', type=int, default=16,
+                        help="Taille minimale d'une frame détectée (pixels opaques)")
+    parser.add_argument('--gap', type=int, default=2,
+                        help="Écart maximal entre morceaux d'une même frame (pixels)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Afficher le découpage sans écrire les frames")
+    args = parser.parse_args()
+    
+    try:
+        slice_sheet(args.sheet, args.character, args.animation, args.category, args.assets,
+                    args.grid, args.frame_size, args.start, args.min_pixels, args.gap,
+                    write=not args.dry_run)
+    except ValueError as e:
+        print(f"❌ {e}")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡ Traitement par lots des sprites sur plusieurs cœurs
+Répartit le travail par fichier sur un pool de processus tout en gardant
+les résultats et les logs dans l'ordre des fichiers
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+def resolve_jobs(jobs):
+    """Nombre de processus à utiliser (0 ou None = tous les cœurs)"""
+    
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, int(jobs))
+
+def run_captured(func, args):
+    """Exécute func(*args) en capturant ce qu'elle affiche"""
+    
+    output = io.StringIO()
+    with redirect_stdout(output):
+        result = func(*args)
+    return result, output.getvalue()
+
+def run_batch(func, tasks, jobs=1):
+    """Applique func à chaque tuple d'arguments de tasks
+    
+    Les logs de chaque tâche sont affichés d'un bloc, dans l'ordre de tasks,
+    quel que soit l'ordre de fin des processus. Retourne la liste des
+    résultats dans ce même ordre.
+    """
+    
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), max(1, len(tasks)))
+    results = []
+    
+    if jobs == 1:
+        for args in tasks:
+            results.append(func(*args))
+        return results
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # map() rend les résultats dans l'ordre de soumission
+        for result, output in executor.map(run_captured, [func] * len(tasks), tasks):
+            print(output, end="")
+            results.append(result)
+    
+    return results
+
+def batch_counts(total, cached, results):
+    """Bilan d'un lot: {'total', 'cached', 'done', 'failed'}
+    
+    cached: tâches sautées car à jour; results: résultats des tâches
+    exécutées (vrai = réussie).
+    """
+    
+    done = sum(1 for result in results if result)
+    return {'total': total, 'cached': cached, 'done': done, 'failed': len(results) - done}
+
+def batch_ok(counts):
+    """Vrai si le lot avait des fichiers et qu'aucun n'a échoué"""
+    
+    return counts['total'] > 0 and counts['failed'] == 0
+
+def add_jobs_argument(parser):
+    """Ajoute l'option --jobs commune aux scripts du pipeline"""
+    
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help="Nombre de processus en parallèle (0 = tous les cœurs)"
+    )
+    return parser
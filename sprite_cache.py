@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗃️ Cache de construction incrémentale des sprites
+Un manifeste par dossier de sortie mémorise, pour chaque sprite généré,
+l'empreinte de la source et des paramètres utilisés: les sprites inchangés
+ne sont pas retraités
+"""
+
+import json
+import hashlib
+from pathlib import Path
+
+CACHE_FILENAME = '.sprite_cache.json'
+CACHE_VERSION = 1
+
+def file_hash(path):
+    """Empreinte du contenu d'un fichier"""
+    
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def params_hash(params):
+    """Empreinte stable d'un dictionnaire de paramètres de traitement"""
+    
+    encoded = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+def load_manifest(output_dir, filename=CACHE_FILENAME):
+    """Charge le manifeste d'un dossier de sortie (vide si absent ou invalide)"""
+    
+    manifest_path = Path(output_dir) / filename
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == CACHE_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': CACHE_VERSION, 'entries': {}}
+
+def save_manifest(manifest, output_dir, filename=CACHE_FILENAME):
+    """Sauvegarde le manifeste d'un dossier de sortie"""
+    
+    manifest_path = Path(output_dir) / filename
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+def task_outputs(task, base=None):
+    """(clé du manifeste, sorties) d'une tâche
+    
+    task[1] est une sortie, ou une liste [(étiquette, sortie)] produite
+    d'un seul décodage de la source; la clé est alors le nom de la source.
+    Pour une sortie unique, la clé est son nom, ou son chemin relatif à
+    base si fourni (sorties rangées en <perso>/<catégorie>/).
+    """
+    
+    if isinstance(task[1], (list, tuple)):
+        return Path(task[0]).name, [Path(output) for _, output in task[1]]
+    output = Path(task[1])
+    if base is not None:
+        return output.relative_to(base).as_posix(), [output]
+    return output.name, [output]
+
+def split_cached_tasks(manifest, tasks, params, force=False, base=None):
+    """Sépare les tâches à refaire de celles dont la sortie est à jour
+    
+    tasks: liste de tuples (source, sortie, ...) passés tels quels au
+    traitement (voir task_outputs pour plusieurs sorties et base).
+    Retourne (à_faire, à_jour, empreintes) où empreintes donne l'empreinte
+    de la source de chaque tâche à faire, pour record_tasks.
+    """
+    
+    key = params_hash(params)
+    todo, cached, hashes = [], [], []
+    
+    for task in tasks:
+        source = Path(task[0])
+        entry_key, outputs = task_outputs(task, base)
+        source_hash = file_hash(source)
+        entry = manifest['entries'].get(entry_key)
+        
+        up_to_date = (
+            not force
+            and entry is not None
+            and entry['source_hash'] == source_hash
+            and entry['params'] == key
+            and all(output.exists() for output in outputs)
+        )
+        
+        if up_to_date:
+            cached.append(task)
+        else:
+            todo.append(task)
+            hashes.append(source_hash)
+    
+    return todo, cached, hashes
+
+def record_tasks(manifest, tasks, hashes, results, params, base=None):
+    """Enregistre dans le manifeste les tâches traitées avec succès"""
+    
+    key = params_hash(params)
+    for task, source_hash, result in zip(tasks, hashes, results):
+        entry_key, outputs = task_outputs(task, base)
+        if result:
+            manifest['entries'][entry_key] = {
+                'source': str(task[0]),
+                'source_hash': source_hash,
+                'params': key,
+            }
+        else:
+            manifest['entries'].pop(entry_key, None)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📇 Index des sprites organisés par personnage et catégorie
+Un seul parcours de assets/characters/<perso>/<catégorie>/ pour retrouver
+toutes les frames <perso>_<animation><n>.png, sans liste d'animations figée
+"""
+
+import os
+import re
+import copy
+from pathlib import Path
+
+from sprite_schema import DEFAULT_FRAME_DURATION, schema_lookup
+
+# Dossiers de assets/characters qui ne sont pas des personnages
+DERIVED_DIRS = {'cleaned', 'optimized', 'processed', 'skills'}
+
+# <perso>_<animation><n>.png (n optionnel: image fixe comme ninja_icon.png)
+FRAME_PATTERN = re.compile(r'^(?P<character>[a-z]+)_(?P<animation>[a-z_]+?)(?P<frame>\d+)?\.png$')
+
+def parse_sprite_name(filename):
+    """Retourne (personnage, animation, frame) ou None si le nom est invalide
+    
+    frame vaut None pour une image sans numéro.
+    """
+    
+    match = FRAME_PATTERN.match(filename)
+    if not match:
+        return None
+    frame = match.group('frame')
+    return match.group('character'), match.group('animation'), int(frame) if frame else None
+
+def build_sprite_index(assets_dir='assets/characters'):
+    """Indexe toutes les frames du dossier des personnages
+    
+    Retourne {perso: {animation: {'category': catégorie, 'frames': {n: chemin}}}}
+    (n = 0 pour une image sans numéro) et la liste des fichiers ignorés
+    [(chemin, raison)]: nom non reconnu, ou animation déjà trouvée dans une
+    autre catégorie (la première dans l'ordre alphabétique est gardée).
+    """
+    
+    index = {}
+    ignored = []
+    # Noms connus du schéma: simple recherche au lieu de l'analyse du nom
+    known = schema_lookup()
+    
+    with os.scandir(assets_dir) as characters:
+        char_dirs = sorted(
+            (entry for entry in characters
+             if entry.is_dir() and entry.name not in DERIVED_DIRS),
+            key=lambda entry: entry.name
+        )
+    
+    for char_dir in char_dirs:
+        with os.scandir(char_dir.path) as categories:
+            cat_dirs = sorted((entry for entry in categories if entry.is_dir()),
+                              key=lambda entry: entry.name)
+        
+        for cat_dir in cat_dirs:
+            with os.scandir(cat_dir.path) as files:
+                for entry in files:
+                    if not entry.name.endswith('.png'):
+                        continue
+                    
+                    parsed = known.get(entry.name) or parse_sprite_name(entry.name)
+                    if parsed is None or parsed[0] != char_dir.name:
+                        ignored.append((entry.path, "nom non reconnu"))
+                        continue
+                    
+                    character, animation, frame = parsed[:3]
+                    anim_entry = index.setdefault(character, {}).setdefault(
+                        animation, {'category': cat_dir.name, 'frames': {}}
+                    )
+                    if anim_entry['category'] != cat_dir.name:
+                        ignored.append((entry.path, f"{character}_{animation} déjà rangée dans "
+                                                    f"{anim_entry['category']}/"))
+                        continue
+                    anim_entry['frames'][frame or 0] = entry.path
+    
+    return index, ignored
+
+def frame_tasks(index, output_dir, characters=None):
+    """(source, sortie) de chaque frame indexée, triés par chemin
+    
+    La sortie reprend <perso>/<catégorie>/<fichier> sous output_dir.
+    characters: personnages à garder (tous si None).
+    """
+    
+    tasks = []
+    for character in sorted(index):
+        if characters and character not in characters:
+            continue
+        for animation in index[character].values():
+            for path in animation['frames'].values():
+                source = Path(path)
+                output = Path(output_dir) / character / source.parent.name / source.name
+                tasks.append((source, output))
+    return sorted(tasks)
+
+def animation_summary(anim_entry):
+    """Retourne (frames jouables, numéros manquants) d'une animation
+    
+    Les frames jouables sont celles numérotées sans trou à partir de 1
+    (1 pour une image fixe sans numéro).
+    """
+    
+    numbers = sorted(n for n in anim_entry['frames'] if n > 0)
+    if not numbers:
+        return 1, []
+    
+    present = set(numbers)
+    gaps = [n for n in range(1, numbers[-1] + 1) if n not in present]
+    
+    playable = 0
+    while playable + 1 in present:
+        playable += 1
+    
+    return playable, gaps
+
+def schema_from_index(index, frame_duration=DEFAULT_FRAME_DURATION):
+    """Schéma (forme de sprite_schema.json) décrivant les frames indexées"""
+    
+    characters = {}
+    for character in sorted(index):
+        animations = {}
+        for anim in sorted(index[character]):
+            anim_entry = index[character][anim]
+            frame_count, gaps = animation_summary(anim_entry)
+            animations[anim] = {
+                'frames': frame_count,
+                'category': anim_entry['category'],
+                'frameDuration': frame_duration,
+                # False pour une image fixe sans numéro (ninja_icon.png)
+                'numbered': any(n > 0 for n in anim_entry['frames']),
+            }
+        characters[character] = animations
+    
+    return {
+        'version': 1,
+        'frameDuration': frame_duration,
+        'characters': characters,
+    }
+
+def update_schema_from_index(schema, index, frame_duration=DEFAULT_FRAME_DURATION):
+    """Copie du schéma complétée d'après les frames indexées
+    
+    'available' reçoit le nombre de frames jouables trouvées sur le disque
+    (0 si l'animation manque): c'est ce que le jeu charge. Le nombre
+    déclaré ('frames') peut monter mais ne baisse jamais, pour que
+    missing_frames signale toujours une frame attendue mais absente. Les
+    animations trouvées mais non déclarées sont ajoutées.
+    """
+    
+    schema = copy.deepcopy(schema) if schema else schema_from_index({}, frame_duration)
+    found = schema_from_index(index, frame_duration)['characters']
+    
+    for character, animations in found.items():
+        declared = schema['characters'].setdefault(character, {})
+        for anim, config in animations.items():
+            declared.setdefault(anim, dict(config))
+    
+    for character, animations in schema['characters'].items():
+        for anim, config in animations.items():
+            available = found.get(character, {}).get(anim, {}).get('frames', 0)
+            config['available'] = available
+            config['frames'] = max(config['frames'], available)
+        schema['characters'][character] = dict(sorted(animations.items()))
+    
+    schema['characters'] = dict(sorted(schema['characters'].items()))
+    return schema
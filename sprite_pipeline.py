@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏭 Pipeline complet des sprites, appelable depuis Python
+run_pipeline(root, config) enchaîne les outils dans le même processus
+(NumPy et PIL importés une seule fois), sans changement de dossier ni
+attente clavier, et retourne un résultat structuré par étape au lieu
+d'afficher les logs (conservés dans le résultat). Chaque étape travaille
+sur l'index de assets/characters/<perso>/<catégorie>/ et rapporte ses
+compteurs (fichiers, déjà à jour, traités, échecs...). Les atlas ne sont
+pas versionnés: l'étape atlas doit avoir tourné pour que le jeu charge
+chaque personnage en une seule requête au lieu d'une par frame.
+"""
+
+import json
+import time
+import argparse
+from pathlib import Path
+
+from sprite_batch import run_captured, add_jobs_argument, batch_ok
+from sprite_index import build_sprite_index
+from process_sprites import process_character_sprites
+from clean_sprites_advanced import clean_all_sprites
+from auto_adjust_sprites import process_all_sprites, write_animation_manifest
+from clean_skills_background import remove_background_skills
+from resize_skills import resize_skills_sprites
+from pack_atlas import pack_all_characters
+from build_variants import build_variants
+from recompress_sprites import recompress_all
+from palette_sprites import palettize_all
+
+DEFAULT_PIPELINE_CONFIG = {
+    'steps': ['process', 'clean', 'optimize', 'manifest', 'atlas'],
+    'jobs': 1,
+    'force': False,
+    'profile': 'standard',
+    'max_memory': None,
+    'target_size': 80,
+    'padding': 1,
+    'trim': False,
+    'dedup': False,
+    'skills_method': 'numpy',
+    'verbose': False,
+    'stop_on_error': True,
+}
+
+def characters_dir(root):
+    return Path(root) / 'assets' / 'characters'
+
+def step_process(root, config):
+    return process_character_sprites(config['jobs'], config['force'], max_memory=config['max_memory'],
+                                     input_dir=str(characters_dir(root)))
+
+def step_clean(root, config):
+    return clean_all_sprites(config['profile'], config['jobs'], config['force'],
+                             config['max_memory'], assets_dir=characters_dir(root))
+
+def step_optimize(root, config):
+    return process_all_sprites(config['jobs'], config['force'], config['target_size'],
+                               assets_dir=characters_dir(root))
+
+def step_manifest(root, config):
+    index, ignored = build_sprite_index(characters_dir(root))
+    manifest = write_animation_manifest(index, Path(root) / 'sprite_schema.json')
+    return {
+        'characters': len(manifest['characters']),
+        'animations': sum(len(animations) for animations in manifest['characters'].values()),
+        'ignored': len(ignored),
+    }
+
+def step_skills_background(root, config):
+    return {'cleaned': remove_background_skills(config['skills_method'], characters_dir(root) / 'skills')}
+
+def step_skills_resize(root, config):
+    return {'resized': resize_skills_sprites(characters_dir(root) / 'skills', jobs=config['jobs'],
+                                             force=config['force'])}
+
+def step_atlas(root, config):
+    atlases = pack_all_characters(characters_dir(root), Path(root) / 'assets' / 'atlases',
+                                  config['padding'], config['trim'], config['dedup'])
+    return {
+        'atlases': len(atlases),
+        'frames': sum(len(atlas['frames']) for atlas in atlases.values()),
+        'duplicates': sum(len(atlas['duplicates']) for atlas in atlases.values()),
+    }
+
+def step_variants(root, config):
+    index = build_variants(root, jobs=config['jobs'], force=config['force'], padding=config['padding'],
+                           trim=config['trim'])
+    return {'scales': len(index['variants'])}
+
+def step_recompress(root, config):
+    results = recompress_all(sorted(characters_dir(root).rglob('*.png')), config['jobs'])
+    return {
+        'files': len(results),
+        'original_bytes': sum(r['original_bytes'] for r in results),
+        'final_bytes': sum(r['final_bytes'] for r in results),
+    }
+
+def step_palette(root, config):
+    results = palettize_all(characters_dir(root), Path(root) / 'assets' / 'palettes', config['jobs'])
+    return {
+        'characters': len(results),
+        'shared': sum(r['shared'] for r in results),
+        'original_bytes': sum(r['original_bytes'] for r in results),
+        'final_bytes': sum(r['final_bytes'] for r in results),
+    }
+
+def step_ok(result):
+    """Une étape de lot échoue si elle n'a trouvé aucun fichier ou si l'un a échoué"""
+    
+    if isinstance(result, dict) and 'failed' in result:
+        return batch_ok(result)
+    return result is not False
+
+# Étapes disponibles, dans l'ordre où elles s'enchaînent
+PIPELINE_STEPS = {
+    'process': step_process,
+    'clean': step_clean,
+    'optimize': step_optimize,
+    'manifest': step_manifest,
+    'skills_background': step_skills_background,
+    'skills_resize': step_skills_resize,
+    'atlas': step_atlas,
+    'variants': step_variants,
+    'recompress': step_recompress,
+    # Après recompress: les frames sur la palette commune sont réécrites même si
+    # recompress les avait rendues plus petites
+    'palette': step_palette,
+}
+
+def run_pipeline(root='.', config=None):
+    """Exécute les étapes demandées sur le jeu situé dans root
+    
+    config complète DEFAULT_PIPELINE_CONFIG. Retourne
+    {'root', 'ok', 'seconds', 'steps': [{'step', 'ok', 'result', 'seconds',
+    'log', 'error'}]} où result donne les compteurs de l'étape. Une étape
+    échoue si elle lève une exception ou si step_ok la refuse; les
+    suivantes sont alors sautées (stop_on_error).
+    """
+    
+    config = dict(DEFAULT_PIPELINE_CONFIG, **(config or {}))
+    unknown = [step for step in config['steps'] if step not in PIPELINE_STEPS]
+    if unknown:
+        raise ValueError(f"Étapes inconnues: {unknown} (disponibles: {list(PIPELINE_STEPS)})")
+    
+    root = Path(root)
+    if not characters_dir(root).is_dir():
+        raise FileNotFoundError(f"Dossier des personnages introuvable: {characters_dir(root)}")
+    
+    steps = []
+    start = time.perf_counter()
+    
+    for name in config['steps']:
+        step_start = time.perf_counter()
+        result, log, error = None, '', None
+        try:
+            if config['verbose']:
+                result = PIPELINE_STEPS[name](root, config)
+            else:
+                result, log = run_captured(PIPELINE_STEPS[name], (root, config))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        
+        ok = error is None and step_ok(result)
+        steps.append({
+            'step': name,
+            'ok': ok,
+            'result': result,
+            'seconds': time.perf_counter() - step_start,
+            'log': log,
+            'error': error,
+        })
+        if not ok and config['stop_on_error']:
+            break
+    
+    return {
+        'root': str(root),
+        'ok': len(steps) == len(config['steps']) and all(step['ok'] for step in steps),
+        'seconds': time.perf_counter() - start,
+        'steps': steps,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline complet des sprites")
+    parser.add_argument('root', nargs='?', default='.',
+                        help="Dossier du jeu (contenant assets/characters)")
+    parser.add_argument('--steps', nargs='+', choices=list(PIPELINE_STEPS),
+                        default=DEFAULT_PIPELINE_CONFIG['steps'],
+                        help="Étapes à exécuter, dans l'ordre")
+    parser.add_argument('--force', action='store_true',
+                        help="Retraiter tous les sprites en ignorant les caches")
+    parser.add_argument('--trim', action='store_true',
+                        help="Atlas de frames recadrées sur leur contenu (étapes atlas et variants)")
+    parser.add_argument('--dedup', action='store_true',
+                        help="Ranger une seule fois les frames identiques (étape atlas)")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Afficher les logs des outils au lieu de les capturer")
+    parser.add_argument('--json', metavar='FICHIER',
+                        help="Enregistrer le résultat structuré (JSON)")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
+    report = run_pipeline(args.root, {
+        'steps': args.steps,
+        'jobs': args.jobs,
+        'force': args.force,
+        'trim': args.trim,
+        'dedup': args.dedup,
+        'verbose': args.verbose,
+    })
+    
+    print("🏭 PIPELINE DES SPRITES")
+    print("=" * 50)
+    for step in report['steps']:
+        status = '✅' if step['ok'] else '❌'
+        if step['error']:
+            detail = f" - {step['error']}"
+        elif isinstance(step['result'], dict):
+            detail = '  ' + ', '.join(f"{key} {value}" for key, value in step['result'].items())
+        else:
+            detail = ''
+        print(f"   {status} {step['step']:<18} {step['seconds']:6.2f} s{detail}")
+    print(f"\n{'🎉 Terminé' if report['ok'] else '⚠️ Interrompu'} en {report['seconds']:.2f} s")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
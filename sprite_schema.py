@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📐 Schéma des personnages et de leurs animations
+sprite_schema.json est la seule description des animations (personnage →
+animation → catégorie, nombre de frames, durée); les outils Python et les
+pages du jeu la chargent au lieu de tables écrites en dur. 'frames' est le
+nombre attendu, écrit à la main: il ne baisse pas quand des fichiers
+manquent, qui sont alors signalés (missing_frames). 'available' est le
+nombre de frames jouables trouvées sur le disque, mis à jour par l'étape
+manifest du pipeline: c'est ce que le jeu charge.
+"""
+
+import os
+import json
+import argparse
+from pathlib import Path
+
+SCHEMA_PATH = Path(__file__).resolve().parent / 'sprite_schema.json'
+
+# Durée d'une frame par défaut (ms), comme SpriteRenderer.frameRate
+DEFAULT_FRAME_DURATION = 100
+
+# Schémas chargés {chemin: (date ns, schéma, index)}, relus si le fichier change
+_schemas = {}
+
+def frame_filenames(character, animation, config):
+    """Noms des fichiers attendus d'une animation: [(n, nom)]
+    
+    n = 0 pour une image fixe sans numéro (ninja_icon.png).
+    """
+    
+    if config.get('numbered', True) is False:
+        return [(0, f"{character}_{animation}.png")]
+    return [(n, f"{character}_{animation}{n}.png") for n in range(1, config['frames'] + 1)]
+
+def build_schema_index(schema):
+    """Index précalculé {nom de fichier: (perso, animation, n, catégorie)}"""
+    
+    lookup = {}
+    for character, animations in schema['characters'].items():
+        for animation, config in animations.items():
+            for n, filename in frame_filenames(character, animation, config):
+                lookup[filename] = (character, animation, n, config['category'])
+    return lookup
+
+def _load(path):
+    path = str(path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None, {}
+    
+    cached = _schemas.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        cached = (mtime, schema, build_schema_index(schema))
+        _schemas[path] = cached
+    return cached[1], cached[2]
+
+def load_sprite_schema(path=SCHEMA_PATH):
+    """Schéma des animations (None si le fichier n'existe pas)"""
+    
+    return _load(path)[0]
+
+def schema_lookup(path=SCHEMA_PATH):
+    """Index {nom de fichier: (perso, animation, n, catégorie)} du schéma"""
+    
+    return _load(path)[1]
+
+def schema_categories(schema):
+    """{perso: {catégorie: [animations]}} pour ranger les sprites"""
+    
+    categories = {}
+    for character, animations in schema['characters'].items():
+        for animation, config in animations.items():
+            categories.setdefault(character, {}).setdefault(config['category'], []).append(animation)
+    return categories
+
+def missing_frames(schema, index):
+    """Frames du schéma absentes de l'index: [(perso, animation, n, nom)]"""
+    
+    missing = []
+    for character, animations in schema['characters'].items():
+        for animation, config in animations.items():
+            frames = index.get(character, {}).get(animation, {}).get('frames', {})
+            for n, filename in frame_filenames(character, animation, config):
+                if n not in frames:
+                    missing.append((character, animation, n, filename))
+    return missing
+
+def save_sprite_schema(schema, path=SCHEMA_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Schéma des animations des personnages")
+    parser.add_argument('--from-assets', metavar='DOSSIER',
+                        help="Compléter le schéma d'après les frames présentes dans ce dossier "
+                             "(les nombres déclarés ne baissent pas)")
+    parser.add_argument('--schema', default=str(SCHEMA_PATH),
+                        help="Fichier du schéma")
+    args = parser.parse_args()
+    
+    if args.from_assets:
+        from sprite_index import build_sprite_index, update_schema_from_index
+        
+        index, ignored = build_sprite_index(args.from_assets)
+        save_sprite_schema(update_schema_from_index(load_sprite_schema(args.schema), index), args.schema)
+        print(f"📝 Schéma complété d'après {args.from_assets}: {args.schema}")
+    
+    schema = load_sprite_schema(args.schema)
+    if schema is None:
+        print(f"❌ Schéma introuvable: {args.schema}")
+        exit(1)
+    
+    print("📐 SCHÉMA DES ANIMATIONS")
+    print("=" * 50)
+    for character, animations in schema['characters'].items():
+        frames = sum(len(frame_filenames(character, name, config)) for name, config in animations.items())
+        available = sum(config.get('available', config['frames']) for config in animations.values())
+        print(f"   {character}: {len(animations)} animations, {frames} frames ({available} disponibles)")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧱 Traitement par bandes des très grandes planches de sprites
+Découpe une image en bandes horizontales dont la taille est calculée à
+partir d'un budget mémoire, avec des lignes de recouvrement pour que les
+filtres de voisinage donnent le même résultat qu'en une seule passe
+"""
+
+import numpy as np
+from PIL import Image
+
+# Estimation de la mémoire de travail par pixel d'une bande (copie RGBA,
+# canaux convertis en int16, masques booléens et temporaires numpy)
+WORK_BYTES_PER_PIXEL = 32
+
+def rows_per_strip(width, height, max_memory=None):
+    """Nombre de lignes par bande pour rester sous max_memory octets"""
+    
+    if not max_memory:
+        return max(1, height)
+    return max(1, min(height, int(max_memory) // (max(1, width) * WORK_BYTES_PER_PIXEL)))
+
+def strip_boxes(width, height, max_memory=None, min_rows=1):
+    """Liste des bandes (haut, bas) couvrant l'image"""
+    
+    rows = max(min_rows, rows_per_strip(width, height, max_memory))
+    return [(top, min(height, top + rows)) for top in range(0, height, rows)]
+
+def map_strips(img, func, max_memory=None):
+    """Applique func(array RGBA de la bande, haut) à chaque bande, sans écrire
+    
+    Retourne la liste des résultats, dans l'ordre des bandes.
+    """
+    
+    results = []
+    for top, bottom in strip_boxes(img.width, img.height, max_memory):
+        strip = np.array(img.crop((0, top, img.width, bottom)))
+        results.append(func(strip, top))
+    return results
+
+def process_strips(img, func, max_memory=None, halo=0):
+    """Transforme une image RGBA en place, bande par bande
+    
+    func reçoit un array contenant la bande entourée de `halo` lignes
+    d'origine au-dessus et au-dessous (moins aux bords de l'image) et le
+    nombre de lignes ajoutées au-dessus; elle retourne l'array transformé
+    de même forme. Seules les lignes de la bande sont réécrites.
+    
+    Les lignes du dessus sont prises avant réécriture de la bande
+    précédente, donc chaque bande voit exactement les pixels d'origine.
+    """
+    
+    width, height = img.size
+    previous_tail = None
+    
+    for top, bottom in strip_boxes(width, height, max_memory, max(1, halo)):
+        # Lignes d'origine sous la bande (pas encore traitées)
+        lower = min(height, bottom + halo)
+        core = np.array(img.crop((0, top, width, lower)))
+        
+        if previous_tail is not None and len(previous_tail):
+            strip = np.concatenate([previous_tail, core])
+        else:
+            strip = core
+        above = len(strip) - len(core)
+        
+        # Garder les lignes d'origine de la fin de la bande pour la suivante
+        core_rows = bottom - top
+        previous_tail = core[max(0, core_rows - halo):core_rows].copy() if halo else None
+        
+        result = func(strip, above)
+        img.paste(Image.fromarray(np.ascontiguousarray(result[above:above + core_rows]), 'RGBA'),
+                  (0, top))
+    
+    return img
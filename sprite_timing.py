@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏲️ Chronométrage par étape du pipeline de sprites
+Les fonctions de traitement marquent leurs étapes (décodage, masque,
+encodage...); run_timed() récupère ces durées pour chaque fichier d'un lot,
+et timing_report() nomme l'étape dominante et les fichiers les plus lents.
+Un profil cProfile complet peut être enregistré sur demande.
+"""
+
+import io
+import json
+import time
+import pstats
+import cProfile
+from contextlib import contextmanager
+
+# Durées de l'appel en cours (None hors de run_timed: pas de mesure)
+_timings = None
+
+@contextmanager
+def stage(name):
+    """Ajoute la durée du bloc à l'étape `name` de l'appel chronométré"""
+    
+    if _timings is None:
+        yield
+        return
+    
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings[name] = _timings.get(name, 0.0) + time.perf_counter() - start
+
+def run_timed(func, *args):
+    """Exécute func(*args) et retourne (résultat, {étape: secondes})
+    
+    La durée totale est dans la clé 'total'. Utilisable comme tâche de
+    run_batch: les durées reviennent des processus avec le résultat.
+    """
+    
+    global _timings
+    
+    previous, _timings = _timings, {}
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    finally:
+        timings, _timings = _timings, previous
+    timings['total'] = time.perf_counter() - start
+    
+    return result, timings
+
+def timing_report(files, timings, output_path=None, top=5):
+    """Affiche les durées cumulées par étape et les fichiers les plus lents
+    
+    Avec output_path, enregistre aussi le détail par fichier en JSON.
+    """
+    
+    if not timings:
+        return
+    
+    totals = {}
+    for file_timings in timings:
+        for name, seconds in file_timings.items():
+            if name != 'total':
+                totals[name] = totals.get(name, 0.0) + seconds
+    overall = sum(t['total'] for t in timings)
+    
+    print(f"\n⏱️ TEMPS PAR ÉTAPE ({len(timings)} fichiers, {overall:.2f} s)")
+    for name, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f"   {name:<16} {seconds * 1000:9.1f} ms  {seconds / max(overall, 1e-9) * 100:5.1f}%")
+    if totals:
+        print(f"   🔥 Étape dominante: {max(totals, key=totals.get)}")
+    
+    slowest = sorted(zip(files, timings), key=lambda item: -item[1]['total'])[:top]
+    print(f"   🐢 Fichiers les plus lents:")
+    for file, file_timings in slowest:
+        hot = max((n for n in file_timings if n != 'total'), key=file_timings.get, default='-')
+        print(f"      {file_timings['total'] * 1000:8.1f} ms  {file} ({hot})")
+    
+    if output_path:
+        report = {
+            'total': overall,
+            'stages': totals,
+            'files': [dict(file=str(file), stages=file_timings)
+                      for file, file_timings in zip(files, timings)],
+        }
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"   💾 Détail enregistré: {output_path}")
+
+def profile_call(output_path, func, *args, top=15):
+    """Exécute func(*args) sous cProfile et enregistre les statistiques
+    
+    Le fichier se lit avec pstats ou snakeviz; les fonctions les plus
+    coûteuses (temps cumulé) sont aussi affichées.
+    """
+    
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = func(*args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output_path)
+    
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(top)
+    print(f"\n🔬 PROFIL cProfile → {output_path}")
+    print(summary.getvalue())
+    
+    return result
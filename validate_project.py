@@ -9,6 +9,9 @@ import os
 from pathlib import Path
 import json
 
+from sprite_index import build_sprite_index
+from sprite_schema import load_sprite_schema, missing_frames
+
 def validate_project():
     """Validation complète du projet"""
     
@@ -48,27 +51,24 @@ def validate_project():
     
     # 3. Vérification des animations ninja
     print("\n🥷 3. ANIMATIONS NINJA:")
-    animations = {
-        'idle': 4,
-        'walk': 6,
-        'jump': 4,
-        'attack': 4,
-        'hurt': 2
-    }
+    schema = load_sprite_schema()
+    animations = schema['characters']['ninja']
     
     assets_dir = Path('./assets/characters')
+    # Un seul parcours au lieu d'un exists() par fichier attendu
+    index, ignored = build_sprite_index(assets_dir)
+    missing = {}
+    for character, anim, n, filename in missing_frames(schema, index):
+        missing[character, anim] = missing.get((character, anim), 0) + 1
     total_frames = 0
     found_frames = 0
     
-    for anim, count in animations.items():
+    for anim, config in animations.items():
         print(f"   📋 {anim}:", end=" ")
-        found = 0
-        for i in range(1, count + 1):
-            filename = f"ninja_{anim}{i}.png"
-            if (assets_dir / filename).exists():
-                found += 1
-                found_frames += 1
-            total_frames += 1
+        count = config['frames']
+        found = count - missing.get(('ninja', anim), 0)
+        found_frames += found
+        total_frames += count
         
         if found == count:
             print(f"✅ {found}/{count}")
@@ -77,17 +77,13 @@ def validate_project():
     
     # 4. Vérification des autres assets
     print("\n🎨 4. AUTRES PERSONNAGES:")
-    other_chars = ['warrior', 'robot', 'mage']
-    other_anims = ['idle', 'walk', 'jump', 'attack', 'hurt', 'icon']
+    other_chars = [char for char in schema['characters'] if char != 'ninja']
     
     for char in other_chars:
+        other_anims = schema['characters'][char]
         print(f"   {char}:", end=" ")
-        char_files = 0
-        for anim in other_anims:
-            filename = f"{char}_{anim}.png"
-            if (assets_dir / filename).exists():
-                char_files += 1
-        print(f"{char_files}/{len(other_anims)} fichiers")
+        char_files = sum(1 for anim in other_anims if (char, anim) not in missing)
+        print(f"{char_files}/{len(other_anims)} animations complètes")
     
     # 5. Test de chargement HTML
     print("\n🌐 5. VALIDATION HTML:")
@@ -115,7 +111,7 @@ def validate_project():
     print("\n🚀 7. INSTRUCTIONS DE LANCEMENT:")
     print("   1️⃣ python -m http.server 8000")
     print("   2️⃣ Ouvrir: http://localhost:8000/animated.html")
-    print("   3️⃣ Attendre le chargement des 20 sprites")
+    print(f"   3️⃣ Attendre le chargement des {total_frames} sprites")
     print("   4️⃣ Cliquer 'COMMENCER LE COMBAT !'")
     
     # 8. Status global
@@ -135,12 +131,16 @@ def validate_project():
 def get_project_size():
     """Calcule la taille approximative du projet"""
     total_size = 0
-    extensions = ['.html', '.js', '.css', '.py', '.png', '.jpg', '.md']
-    
-    for ext in extensions:
-        for file in Path('.').rglob(f'*{ext}'):
-            if file.is_file():
-                total_size += file.stat().st_size
+    extensions = ('.html', '.js', '.css', '.py', '.png', '.jpg', '.md')
+    
+    # Un seul parcours de l'arborescence pour toutes les extensions
+    for dirpath, dirnames, filenames in os.walk('.'):
+        for name in filenames:
+            if name.endswith(extensions):
+                try:
+                    total_size += os.stat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    pass
     
     # Conversion en unités lisibles
     if total_size < 1024:
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔎 Validation rapide des sprites
+Les dimensions et le type de couleur sont lus dans le chunk IHDR (quelques
+octets) au lieu de décoder l'image; l'arborescence est indexée en un seul
+parcours; le décodage complet (pixels blancs, contenu sur les bordures)
+n'est refait que pour les fichiers dont le contenu a changé depuis la
+dernière validation
+"""
+
+import os
+import struct
+import argparse
+import numpy as np
+
+from sprite_cache import load_manifest, save_manifest, file_hash
+from sprite_index import build_sprite_index, animation_summary
+from sprite_schema import load_sprite_schema, missing_frames
+from image_cache import load_image
+from recompress_sprites import PNG_SIGNATURE
+
+VALIDATION_FILENAME = '.sprite_validation.json'
+
+# Types de couleur PNG → mode équivalent
+PNG_MODES = {0: 'L', 2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+
+def read_png_info(path):
+    """Lit l'en-tête d'un PNG sans décoder les pixels
+    
+    Retourne largeur, hauteur, profondeur, type de couleur, mode et la
+    présence de transparence (canal alpha ou chunk tRNS avant IDAT).
+    """
+    
+    with open(path, 'rb') as f:
+        if f.read(8) != PNG_SIGNATURE:
+            raise ValueError("signature PNG absente")
+        
+        length, tag = struct.unpack('>I4s', f.read(8))
+        if tag != b'IHDR' or length != 13:
+            raise ValueError("chunk IHDR manquant")
+        width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', f.read(13))
+        f.seek(4, os.SEEK_CUR)
+        
+        # Chunks auxiliaires jusqu'aux données: seul tRNS nous intéresse
+        transparency = False
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, tag = struct.unpack('>I4s', header)
+            if tag in (b'IDAT', b'IEND'):
+                break
+            transparency = transparency or tag == b'tRNS'
+            f.seek(length + 4, os.SEEK_CUR)
+    
+    return {
+        'width': width,
+        'height': height,
+        'bit_depth': bit_depth,
+        'color_type': color_type,
+        'mode': PNG_MODES.get(color_type, '?'),
+        'alpha': color_type in (4, 6) or transparency,
+        'interlace': interlace,
+    }
+
+def count_white_pixels(data):
+    """Compte les pixels blancs non transparents (résidus de fond)"""
+    
+    return int(np.sum(
+        (data[:,:,0] > 240) &
+        (data[:,:,1] > 240) &
+        (data[:,:,2] > 240) &
+        (data[:,:,3] > 0)  # Non transparents
+    ))
+
+def content_issues(data):
+    """Problèmes visibles seulement dans les pixels (image RGBA décodée)"""
+    
+    issues = []
+    
+    white_pixels = count_white_pixels(data)
+    if white_pixels > 0:
+        issues.append(f"{white_pixels} pixels blancs")
+    
+    border_has_content = (
+        np.any(data[0,:,3] > 0) or   # Top
+        np.any(data[-1,:,3] > 0) or  # Bottom
+        np.any(data[:,0,3] > 0) or   # Left
+        np.any(data[:,-1,3] > 0)     # Right
+    )
+    if border_has_content:
+        issues.append("contenu sur les bordures")
+    
+    return issues
+
+def header_issues(info, expected_size=None):
+    """Problèmes détectables dans l'en-tête seul"""
+    
+    issues = []
+    if expected_size and (info['width'], info['height']) != tuple(expected_size):
+        issues.append(f"taille {info['width']}x{info['height']} "
+                      f"(attendu {expected_size[0]}x{expected_size[1]})")
+    if not info['alpha']:
+        issues.append(f"pas de transparence (mode {info['mode']})")
+    if info['bit_depth'] != 8:
+        issues.append(f"profondeur {info['bit_depth']} bits")
+    return issues
+
+def check_sprite_files(paths, cache_dir, expected_size=None, force=False):
+    """Vérifie une liste de sprites en réutilisant la validation précédente
+    
+    Un fichier dont la date et la taille n'ont pas bougé n'est pas relu; un
+    fichier modifié est relu (en-tête + empreinte) mais n'est décodé que si
+    son contenu a réellement changé. Retourne ({chemin: infos + 'issues'},
+    statistiques).
+    """
+    
+    manifest = load_manifest(cache_dir, VALIDATION_FILENAME)
+    entries = manifest['entries']
+    results = {}
+    stats = {'files': 0, 'headers': 0, 'decoded': 0}
+    
+    for path in paths:
+        key = str(path)
+        stats['files'] += 1
+        try:
+            stat = os.stat(path)
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = entries.get(key)
+            
+            if force or entry is None or entry['stat'] != signature:
+                info = read_png_info(path)
+                source_hash = file_hash(path)
+                stats['headers'] += 1
+                
+                if not force and entry is not None and entry['hash'] == source_hash:
+                    content = entry['content']
+                else:
+                    content = content_issues(np.array(load_image(path)))
+                    stats['decoded'] += 1
+                
+                entry = {'stat': signature, 'hash': source_hash, 'header': info, 'content': content}
+                entries[key] = entry
+            
+            results[key] = dict(entry['header'], issues=header_issues(entry['header'], expected_size)
+                                + entry['content'])
+        except (OSError, ValueError, struct.error) as e:
+            entries.pop(key, None)
+            results[key] = {'issues': [f"PNG illisible: {e}"]}
+    
+    # Oublier les fichiers supprimés depuis
+    for key in [key for key in entries if key not in results and not os.path.exists(key)]:
+        del entries[key]
+    
+    save_manifest(manifest, cache_dir, VALIDATION_FILENAME)
+    return results, stats
+
+def validate_sprites(assets_dir='assets/characters', expected_size=(80, 80), force=False):
+    """Valide l'arborescence des personnages: noms, frames, en-têtes, pixels"""
+    
+    print("🔎 VALIDATION DES SPRITES")
+    print("=" * 50)
+    
+    index, ignored = build_sprite_index(assets_dir)
+    problems = [f"{path}: {reason}" for path, reason in ignored]
+    
+    paths = []
+    for character in sorted(index):
+        animations = index[character]
+        print(f"\n   {character}: {len(animations)} animations")
+        for name, entry in sorted(animations.items()):
+            playable, gaps = animation_summary(entry)
+            if gaps:
+                problems.append(f"{character}_{name}: frames manquantes {gaps}")
+            paths.extend(path for _, path in sorted(entry['frames'].items()))
+    
+    # Frames déclarées dans sprite_schema.json mais absentes du disque
+    schema = load_sprite_schema()
+    if schema is not None:
+        for character, name, n, filename in missing_frames(schema, index):
+            problems.append(f"{filename}: attendue par le schéma, absente")
+    
+    results, stats = check_sprite_files(paths, assets_dir, expected_size, force)
+    for path, result in results.items():
+        if result['issues']:
+            problems.append(f"{os.path.relpath(path, assets_dir)}: {', '.join(result['issues'])}")
+    
+    print(f"\n📊 {stats['files']} fichiers, {stats['headers']} relus, {stats['decoded']} décodés")
+    if problems:
+        print(f"\n⚠️ {len(problems)} problème(s):")
+        for problem in problems:
+            print(f"   - {problem}")
+        return False
+    
+    print(f"\n🎉 Tous les sprites sont valides!")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validation rapide des sprites")
+    parser.add_argument('--assets', default='assets/characters',
+                        help="Dossier des personnages")
+    parser.add_argument('--size', type=int, nargs=2, default=[80, 80], metavar=('L', 'H'),
+                        help="Taille attendue des frames")
+    parser.add_argument('--any-size', action='store_true',
+                        help="Ne pas vérifier la taille des frames")
+    parser.add_argument('--force', action='store_true',
+                        help="Tout revérifier en ignorant la validation précédente")
+    args = parser.parse_args()
+    
+    success = validate_sprites(args.assets, None if args.any_size else args.size, args.force)
+    exit(0 if success else 1)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+👀 Mode surveillance des sprites
+Surveille assets/characters/<perso>/<catégorie>/ et, à chaque sauvegarde,
+renettoie uniquement les frames modifiées (nettoyage + mise à 80x80) dans
+le dossier de build, puis met à jour l'atlas du personnage: la frame est
+recopiée à sa place quand sa taille ne change pas, l'atlas n'est
+reconstruit que si des frames apparaissent, disparaissent ou changent de
+taille. L'index (date, taille) évite de relire les fichiers inchangés.
+Ces atlas de développement (encodage rapide, frames nettoyées) vont dans
+assets/build/atlases/, pas dans assets/atlases/ produit par pack_atlas.py.
+"""
+
+import os
+import time
+import argparse
+from pathlib import Path
+
+from sprite_batch import run_batch, add_jobs_argument
+from sprite_index import DERIVED_DIRS, build_sprite_index, parse_sprite_name
+from image_cache import load_image
+from clean_sprites_advanced import CLEANING_PROFILES, clean_sprite_advanced
+from auto_adjust_sprites import write_animation_manifest
+from pack_atlas import pack_character, pack_all_characters, patch_atlas
+
+# Intervalle entre deux parcours de l'arborescence (secondes)
+WATCH_POLL_INTERVAL = 0.02
+# Délai sans nouvelle modification avant de traiter une rafale (secondes):
+# au moins deux parcours sans changement, sinon rien n'est regroupé
+WATCH_DEBOUNCE = 0.06
+
+def scan_frames(assets_dir):
+    """Index {chemin: (date ns, taille)} des frames des personnages"""
+    
+    snapshot = {}
+    with os.scandir(assets_dir) as characters:
+        char_dirs = [entry for entry in characters
+                     if entry.is_dir() and entry.name not in DERIVED_DIRS]
+    
+    for char_dir in char_dirs:
+        with os.scandir(char_dir.path) as categories:
+            cat_dirs = [entry for entry in categories if entry.is_dir()]
+        
+        for cat_dir in cat_dirs:
+            with os.scandir(cat_dir.path) as files:
+                for entry in files:
+                    if entry.name.endswith('.png') and parse_sprite_name(entry.name):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    
+    return snapshot
+
+def diff_snapshots(old, new):
+    """(frames ajoutées ou modifiées, frames supprimées) entre deux index"""
+    
+    changed = [path for path, key in new.items() if old.get(path) != key]
+    removed = [path for path in old if path not in new]
+    return changed, removed
+
+def build_path(source, assets_dir, build_dir):
+    """Chemin de la frame nettoyée: même arborescence sous build_dir"""
+    
+    return Path(build_dir) / Path(source).relative_to(assets_dir)
+
+def character_of(path):
+    return parse_sprite_name(Path(path).name)[0]
+
+def rebuild_frames(sources, assets_dir, build_dir, profile, jobs=1):
+    """Nettoie les frames sources vers le build; retourne celles réussies"""
+    
+    tasks = []
+    for source in sources:
+        output = build_path(source, assets_dir, build_dir)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tasks.append((source, output, profile))
+    
+    results = run_batch(clean_sprite_advanced, tasks, jobs)
+    return [task[1] for task, ok in zip(tasks, results) if ok]
+
+def update_atlases(built, structural, build_dir, atlas_dir, padding=1):
+    """Met à jour les atlas touchés par des frames reconstruites
+    
+    built: frames nettoyées à recopier; structural: personnages dont la
+    liste de frames a changé (reconstruction complète de l'atlas).
+    """
+    
+    by_character = {}
+    for path in built:
+        by_character.setdefault(character_of(path), []).append(path)
+    
+    repack = set(structural)
+    for character, paths in by_character.items():
+        if character in repack:
+            continue
+        frames = [(Path(path).stem, load_image(path)) for path in paths]
+        if patch_atlas(character, frames, atlas_dir) is None:
+            repack.add(character)
+        else:
+            print(f"   🧩 {character}: {len(frames)} frame(s) remplacée(s) dans l'atlas")
+    
+    if repack:
+        index, _ = build_sprite_index(build_dir)
+        for character in sorted(repack):
+            pack_character(index, character, atlas_dir, padding, optimize=False)
+
+def initial_build(assets_dir, build_dir, atlas_dir, profile, padding=1, jobs=1):
+    """Nettoie les frames dont le build manque ou est plus ancien, puis
+    construit tous les atlas; retourne l'index de départ"""
+    
+    snapshot = scan_frames(assets_dir)
+    stale = []
+    for source, (mtime, size) in snapshot.items():
+        output = build_path(source, assets_dir, build_dir)
+        if not output.exists() or output.stat().st_mtime_ns < mtime:
+            stale.append(source)
+    
+    print(f"👀 {len(snapshot)} frames surveillées, {len(stale)} à reconstruire")
+    rebuild_frames(sorted(stale), assets_dir, build_dir, profile, jobs)
+    
+    # Builds orphelins (source supprimée pendant que la surveillance était arrêtée)
+    expected = {build_path(source, assets_dir, build_dir) for source in snapshot}
+    for output in Path(build_dir).glob('*/*/*.png'):
+        if output not in expected:
+            output.unlink()
+    
+    pack_all_characters(build_dir, atlas_dir, padding)
+    return snapshot
+
+def watch_sprites(assets_dir='assets/characters', build_dir='assets/build', atlas_dir='assets/build/atlases',
+                  profile='standard', padding=1, jobs=1, interval=WATCH_POLL_INTERVAL,
+                  debounce=WATCH_DEBOUNCE, manifest_path='sprite_schema.json'):
+    """Boucle de surveillance (Ctrl+C pour arrêter)"""
+    
+    # Un délai plus court qu'un parcours ne regrouperait aucune sauvegarde
+    debounce = max(debounce, 2 * interval)
+    
+    snapshot = initial_build(assets_dir, build_dir, atlas_dir, profile, padding, jobs)
+    print(f"\n👀 Surveillance de {assets_dir} (Ctrl+C pour arrêter)")
+    
+    pending = {}
+    last_change = None
+    
+    try:
+        while True:
+            time.sleep(interval)
+            current = scan_frames(assets_dir)
+            changed, removed = diff_snapshots(snapshot, current)
+            snapshot = current
+            
+            now = time.perf_counter()
+            for path in changed:
+                pending[path] = 'changed'
+            for path in removed:
+                pending[path] = 'removed'
+            if changed or removed:
+                last_change = now
+            
+            # Attendre la fin d'une rafale de sauvegardes
+            if not pending or now - last_change < debounce:
+                continue
+            
+            start = time.perf_counter()
+            changed = sorted(path for path, kind in pending.items() if kind == 'changed')
+            removed = sorted(path for path, kind in pending.items() if kind == 'removed')
+            pending = {}
+            
+            # Frames apparues ou disparues: l'atlas et le manifeste changent de forme
+            structural = {character_of(path) for path in removed}
+            for path in changed:
+                if not build_path(path, assets_dir, build_dir).exists():
+                    structural.add(character_of(path))
+            
+            for path in removed:
+                output = build_path(path, assets_dir, build_dir)
+                if output.exists():
+                    output.unlink()
+                print(f"   🗑️ {Path(path).name} supprimée")
+            
+            built = rebuild_frames(changed, assets_dir, build_dir, profile, jobs)
+            update_atlases(built, structural, build_dir, atlas_dir, padding)
+            
+            if structural and manifest_path:
+                index, _ = build_sprite_index(assets_dir)
+                write_animation_manifest(index, manifest_path)
+            
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"⚡ {len(changed)} frame(s) reconstruite(s), {len(removed)} supprimée(s) "
+                  f"en {elapsed:.0f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Surveillance arrêtée")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Surveillance et reconstruction des sprites modifiés")
+    parser.add_argument('--root', default='.',
+                        help="Dossier du jeu (contenant assets/characters)")
+    parser.add_argument('--profile', default='standard', choices=list(CLEANING_PROFILES),
+                        help="Profil de nettoyage des frames")
+    parser.add_argument('--padding', type=int, default=1,
+                        help="Marge transparente entre les frames des atlas (pixels)")
+    parser.add_argument('--interval', type=float, default=WATCH_POLL_INTERVAL,
+                        help="Intervalle de scrutation (secondes)")
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                        help="Attente après la dernière sauvegarde d'une rafale (secondes)")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
+    root = Path(args.root)
+    build_dir = root / 'assets' / 'build'
+    watch_sprites(root / 'assets' / 'characters', build_dir, build_dir / 'atlases',
+                  args.profile, args.padding, args.jobs, args.interval, args.debounce,
+                  root / 'sprite_schema.json')